@@ -0,0 +1,162 @@
+"""Range-partition expenses by month on created_at
+
+Revision ID: 0002_expenses_partitioning
+Revises: 0001_core_init
+Create Date: 2026-10-19
+
+The existing heap is renamed, a partitioned ``expenses`` parent is created
+with one partition per month (plus a default partition), and rows are copied
+across.  ``ensure_expense_partitions(start_month, months_ahead)`` creates any
+missing monthly partitions and is called by the application on startup and
+periodically afterwards, so future months always exist before rows land.
+
+``created_at`` is used as the partition key because it is NOT NULL and set on
+every insert (``expense_date`` is nullable and OCR-derived).  Postgres requires
+the partition key to be part of the primary key, so the key becomes
+``(id, created_at)``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+revision = "0002_expenses_partitioning"
+down_revision = "0001_core_init"
+branch_labels = None
+depends_on = None
+
+EXPENSE_COLUMNS = (
+    "id, company_id, employee_id, description, category, expense_date, paid_by, remarks, "
+    "amount, currency_code, status, file_url, ocr_text, ocr_json, created_at, updated_at"
+)
+
+# Months of partitions created ahead of "now" by the migration itself.
+INITIAL_MONTHS_AHEAD = 3
+
+
+def _expense_columns():
+    return [
+        sa.Column("id", psql.UUID(as_uuid=True), nullable=False, server_default=sa.text("uuid_generate_v4()")),
+        sa.Column("company_id", psql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", psql.UUID(as_uuid=True), nullable=False),
+
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column("category", sa.String(80)),
+        sa.Column("expense_date", sa.Date),
+        sa.Column("paid_by", sa.String(30)),
+        sa.Column("remarks", sa.Text),
+
+        sa.Column("amount", sa.Numeric(20, 2), nullable=False, server_default="0"),
+        sa.Column("currency_code", sa.String(3), nullable=False, server_default="INR"),
+
+        sa.Column("status", sa.String(20), nullable=False, server_default="draft"),
+        sa.CheckConstraint(
+            "status IN ('draft','submitted','waiting-approval','approved','rejected')",
+            name="ck_expenses_status_valid",
+        ),
+
+        sa.Column("file_url", sa.Text),
+        sa.Column("ocr_text", sa.Text),
+        sa.Column("ocr_json", psql.JSONB),
+
+        sa.Column("created_at", sa.TIMESTAMP(timezone=False), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=False), nullable=False, server_default=sa.text("NOW()")),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"]),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+    ]
+
+
+def _create_indexes_and_trigger() -> None:
+    op.create_index("expenses_company_status_idx", "expenses", ["company_id", "status"])
+    op.create_index("expenses_employee_idx", "expenses", ["employee_id", sa.text("expense_date DESC")])
+    op.execute(
+        """
+        CREATE TRIGGER expenses_set_updated_at
+        BEFORE UPDATE ON expenses
+        FOR EACH ROW EXECUTE PROCEDURE set_updated_at();
+        """
+    )
+
+
+def _rename_old_table(new_name: str) -> None:
+    op.execute("DROP TRIGGER IF EXISTS expenses_set_updated_at ON expenses;")
+    op.rename_table("expenses", new_name)
+    # Index names are schema-wide, so move them out of the way of the new table.
+    op.execute(f"ALTER INDEX expenses_pkey RENAME TO {new_name}_pkey;")
+    op.execute(f"ALTER INDEX expenses_company_status_idx RENAME TO {new_name}_company_status_idx;")
+    op.execute(f"ALTER INDEX expenses_employee_idx RENAME TO {new_name}_employee_idx;")
+
+
+def upgrade() -> None:
+    _rename_old_table("expenses_unpartitioned")
+
+    op.create_table(
+        "expenses",
+        *_expense_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="expenses_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE expenses_default PARTITION OF expenses DEFAULT;")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_expense_partitions(start_month date, months_ahead integer)
+        RETURNS integer AS $$
+        DECLARE
+            month_start date := date_trunc('month', start_month)::date;
+            last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                partition_name := format('expenses_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF expenses FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, month_start, (month_start + interval '1 month')::date
+                    );
+                    created := created + 1;
+                END IF;
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        f"""
+        SELECT ensure_expense_partitions(
+            COALESCE((SELECT min(created_at) FROM expenses_unpartitioned)::date, now()::date),
+            {INITIAL_MONTHS_AHEAD}
+        );
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO expenses ({EXPENSE_COLUMNS}) SELECT {EXPENSE_COLUMNS} FROM expenses_unpartitioned;"
+    )
+    op.drop_table("expenses_unpartitioned")
+
+    _create_indexes_and_trigger()
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS expenses_set_updated_at ON expenses;")
+    op.drop_index("expenses_employee_idx", table_name="expenses")
+    op.drop_index("expenses_company_status_idx", table_name="expenses")
+    op.rename_table("expenses", "expenses_partitioned")
+    op.execute("ALTER INDEX expenses_pkey RENAME TO expenses_partitioned_pkey;")
+
+    op.create_table(
+        "expenses",
+        *_expense_columns(),
+        sa.PrimaryKeyConstraint("id", name="expenses_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO expenses ({EXPENSE_COLUMNS}) SELECT {EXPENSE_COLUMNS} FROM expenses_partitioned;"
+    )
+    # Dropping the parent drops every partition with it.
+    op.drop_table("expenses_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS ensure_expense_partitions(date, integer);")
+
+    _create_indexes_and_trigger()
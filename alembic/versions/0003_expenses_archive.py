@@ -0,0 +1,70 @@
+"""Cold archive table for closed expenses
+
+Revision ID: 0003_expenses_archive
+Revises: 0002_expenses_partitioning
+Create Date: 2026-10-19
+
+Approved/rejected expenses past the retention window are moved here in batches
+by ``archive_expenses.py`` (see ``app/services/archive_service.py``) together
+with their OCR payloads, keeping the hot partitions and their indexes small.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+revision = "0003_expenses_archive"
+down_revision = "0002_expenses_partitioning"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "expenses_archive",
+        sa.Column("id", psql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("company_id", psql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", psql.UUID(as_uuid=True), nullable=False),
+
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column("category", sa.String(80)),
+        sa.Column("expense_date", sa.Date),
+        sa.Column("paid_by", sa.String(30)),
+        sa.Column("remarks", sa.Text),
+
+        sa.Column("amount", sa.Numeric(20, 2), nullable=False),
+        sa.Column("currency_code", sa.String(3), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+
+        sa.Column("file_url", sa.Text),
+        sa.Column("ocr_text", sa.Text),
+        sa.Column("ocr_json", psql.JSONB),
+
+        sa.Column("created_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.Column("archived_at", sa.TIMESTAMP(timezone=False), nullable=False, server_default=sa.text("NOW()")),
+        # Archive rows are written once and never updated: pack pages fully
+        postgresql_with={"fillfactor": "100"},
+    )
+    op.create_index("expenses_archive_employee_idx", "expenses_archive", ["employee_id", sa.text("created_at DESC")])
+    op.create_index("expenses_archive_company_idx", "expenses_archive", ["company_id"])
+
+    # OCR payloads dominate row size; lz4 TOAST compression is faster and smaller
+    # than the pglz default where the server supports it (Postgres 14+ built with lz4).
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            EXECUTE 'ALTER TABLE expenses_archive '
+                    'ALTER COLUMN ocr_text SET COMPRESSION lz4, '
+                    'ALTER COLUMN ocr_json SET COMPRESSION lz4';
+        EXCEPTION WHEN others THEN
+            RAISE NOTICE 'lz4 compression unavailable, keeping default TOAST compression';
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("expenses_archive_company_idx", table_name="expenses_archive")
+    op.drop_index("expenses_archive_employee_idx", table_name="expenses_archive")
+    op.drop_table("expenses_archive")
@@ -0,0 +1,34 @@
+"""Daily FX rate snapshots against a pivot currency
+
+Revision ID: 0004_fx_rates
+Revises: 0003_expenses_archive
+Create Date: 2026-10-19
+
+One row per (pivot, date, currency): units of ``currency_code`` per one unit of
+``pivot_currency``. Any base/quote pair is derived in memory by cross-rate math
+(see ``app/services/fx_service.py``).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_fx_rates"
+down_revision = "0003_expenses_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fx_rates",
+        sa.Column("pivot_currency", sa.String(3), nullable=False),
+        sa.Column("rate_date", sa.Date, nullable=False),
+        sa.Column("currency_code", sa.String(3), nullable=False),
+        sa.Column("rate", sa.Numeric(24, 10), nullable=False),
+        sa.Column("fetched_at", sa.TIMESTAMP(timezone=False), nullable=False, server_default=sa.text("NOW()")),
+        sa.PrimaryKeyConstraint("pivot_currency", "rate_date", "currency_code", name="fx_rates_pkey"),
+        sa.CheckConstraint("rate > 0", name="ck_fx_rates_rate_positive"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fx_rates")
@@ -0,0 +1,52 @@
+"""Indexes for the paginated, searchable user directory
+
+Revision ID: 0005_users_directory_indexes
+Revises: 0004_fx_rates
+Create Date: 2026-10-19
+
+GET /api/users/ pages through a company's users in (last_name, first_name, id)
+order with keyset pagination and supports prefix and fuzzy search on name and
+email (see ``app/services/user_directory.py``):
+
+- ``users_company_name_idx`` serves the keyset order within a company
+- ``users_*_prefix_idx`` (text_pattern_ops) serve ``lower(col) LIKE 'abc%'``
+- ``users_search_trgm_idx`` (pg_trgm GIN) serves fuzzy word-similarity search;
+  its expression must stay identical to ``user_directory.SEARCH_DOCUMENT``
+
+The indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction, so writes to ``users`` are not blocked while they build. A failed
+build leaves an invalid index behind; rerunning the migration drops and
+rebuilds it.
+"""
+from alembic import op
+
+revision = "0005_users_directory_indexes"
+down_revision = "0004_fx_rates"
+branch_labels = None
+depends_on = None
+
+
+USER_INDEXES = {
+    "users_company_name_idx": "(company_id, last_name, first_name, id)",
+    "users_manager_name_idx": "(manager_id, last_name, first_name, id)",
+    "users_email_prefix_idx": "(lower(email) text_pattern_ops)",
+    "users_first_name_prefix_idx": "(lower(first_name) text_pattern_ops)",
+    "users_last_name_prefix_idx": "(lower(last_name) text_pattern_ops)",
+    "users_search_trgm_idx": "USING gin (lower(first_name || ' ' || last_name || ' ' || email) gin_trgm_ops)",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, definition in USER_INDEXES.items():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name} ON users {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(USER_INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm is left installed: other objects may depend on it
@@ -0,0 +1,35 @@
+"""Revoked / already-used refresh tokens
+
+Revision ID: 0006_revoked_tokens
+Revises: 0005_users_directory_indexes
+Create Date: 2026-10-19
+
+Refresh tokens carry a ``jti`` and are rotated on every use: the jti of the
+presented token is inserted here, so a token can be exchanged only once and
+can be revoked explicitly (logout). Rows are useless once ``expires_at`` has
+passed and are purged periodically (see ``app/services/token_revocation.py``).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+
+revision = "0006_revoked_tokens"
+down_revision = "0005_users_directory_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(64), primary_key=True),
+        sa.Column("user_id", psql.UUID(as_uuid=True), nullable=True),
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.Column("revoked_at", sa.TIMESTAMP(timezone=False), nullable=False, server_default=sa.text("NOW()")),
+    )
+    op.create_index("revoked_tokens_expires_idx", "revoked_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("revoked_tokens_expires_idx", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
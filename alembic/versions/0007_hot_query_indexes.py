@@ -0,0 +1,94 @@
+"""Indexes for the hot router queries, built without blocking writes
+
+Revision ID: 0007_hot_query_indexes
+Revises: 0006_revoked_tokens
+Create Date: 2026-10-19
+
+- ``users_company_active_role_idx`` (partial, active users): company stats
+  (count per role), GET /api/users/managers and manager checks on user creation
+- ``expenses_employee_created_idx``: GET /api/expenses/by-employee/{id}, which
+  orders by ``created_at`` (``expenses_employee_idx`` is on ``expense_date``)
+- ``expenses_closed_created_idx`` (partial, approved/rejected): the archive job's
+  oldest-first batches
+
+Already covered, so not duplicated here: ``companies.email`` and ``users.email``
+(unique constraints), ``users.manager_id`` (``users_manager_name_idx``) and the
+GET /api/users/ keyset order (``users_company_name_idx``, which also serves the
+``is_active=false`` and unfiltered listings; a partial copy for active users
+would cost every users write a second index for little gain).
+
+Every index is built with CREATE INDEX CONCURRENTLY outside the migration
+transaction. ``expenses`` is partitioned, which CONCURRENTLY does not support:
+the parent index is created ``ON ONLY`` the parent (invalid, no build) and one
+index per partition is built concurrently and attached; the parent index turns
+valid once every partition has one, and partitions created later get theirs
+automatically. A failed build leaves an invalid index behind; rerunning the
+migration drops and rebuilds it. ``benchmarks/check_query_plans.py`` checks that
+the planner picks these indexes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_hot_query_indexes"
+down_revision = "0006_revoked_tokens"
+branch_labels = None
+depends_on = None
+
+USER_INDEXES = {
+    "users_company_active_role_idx": "(company_id, role) WHERE is_active",
+}
+
+EXPENSE_INDEXES = {
+    "expenses_employee_created_idx": "(employee_id, created_at DESC)",
+    "expenses_closed_created_idx": "(created_at) WHERE status IN ('approved', 'rejected')",
+}
+
+# Partitions of expenses that have no index attached to the given parent index yet
+_UNINDEXED_PARTITIONS_SQL = sa.text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'expenses'::regclass
+      AND NOT EXISTS (
+          SELECT 1
+          FROM pg_inherits ii
+          JOIN pg_index x ON x.indexrelid = ii.inhrelid
+          WHERE ii.inhparent = to_regclass(:parent_index) AND x.indrelid = c.oid
+      )
+    ORDER BY c.relname
+""")
+
+
+def _create_partitioned_index(name: str, definition: str) -> None:
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY expenses {definition}")
+    suffix = name[len("expenses_"):]
+    bind = op.get_bind()
+    # Loop: ensure_expense_partitions() may add a partition while we build
+    while True:
+        partitions = bind.execute(_UNINDEXED_PARTITIONS_SQL, {"parent_index": name}).scalars().all()
+        if not partitions:
+            break
+        for partition in partitions:
+            partition_index = f"{partition}_{suffix}"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {partition_index}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {partition_index} ON {partition} {definition}")
+            op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in USER_INDEXES.items():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name} ON users {definition}")
+        for name, definition in EXPENSE_INDEXES.items():
+            _create_partitioned_index(name, definition)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Dropping a partitioned index drops the partitions' indexes with it
+        # (and cannot be done concurrently)
+        for name in reversed(list(EXPENSE_INDEXES)):
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        for name in reversed(list(USER_INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,100 @@
+"""Move default-partition rows into new monthly partitions
+
+Revision ID: 0008_partition_default_rows
+Revises: 0007_hot_query_indexes
+Create Date: 2026-10-19
+
+Rows whose month had no partition yet land in ``expenses_default``, and
+Postgres then refuses ``CREATE TABLE ... PARTITION OF`` for that month.
+``ensure_expense_partitions`` now checks the default partition first: when it
+holds rows for the month, the partition is created as a plain table, those
+rows are moved into it and it is attached (indexes and triggers are added on
+attach). Partitions for months without such rows are created as before.
+"""
+from alembic import op
+
+revision = "0008_partition_default_rows"
+down_revision = "0007_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_expense_partitions(start_month date, months_ahead integer)
+        RETURNS integer AS $$
+        DECLARE
+            month_start date := date_trunc('month', start_month)::date;
+            month_end date;
+            last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+            partition_name text;
+            moved bigint;
+            created integer := 0;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                month_end := (month_start + interval '1 month')::date;
+                partition_name := format('expenses_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    IF EXISTS (
+                        SELECT 1 FROM expenses_default WHERE created_at >= month_start AND created_at < month_end
+                    ) THEN
+                        EXECUTE format(
+                            'CREATE TABLE %I (LIKE expenses INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                            partition_name
+                        );
+                        EXECUTE format(
+                            'WITH moved_rows AS (DELETE FROM expenses_default WHERE created_at >= %L AND created_at < %L '
+                            'RETURNING *) INSERT INTO %I SELECT * FROM moved_rows',
+                            month_start, month_end, partition_name
+                        );
+                        GET DIAGNOSTICS moved = ROW_COUNT;
+                        EXECUTE format(
+                            'ALTER TABLE expenses ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                            partition_name, month_start, month_end
+                        );
+                        RAISE NOTICE 'Moved % row(s) from expenses_default into %', moved, partition_name;
+                    ELSE
+                        EXECUTE format(
+                            'CREATE TABLE %I PARTITION OF expenses FOR VALUES FROM (%L) TO (%L)',
+                            partition_name, month_start, month_end
+                        );
+                    END IF;
+                    created := created + 1;
+                END IF;
+                month_start := month_end;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_expense_partitions(start_month date, months_ahead integer)
+        RETURNS integer AS $$
+        DECLARE
+            month_start date := date_trunc('month', start_month)::date;
+            last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                partition_name := format('expenses_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF expenses FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, month_start, (month_start + interval '1 month')::date
+                    );
+                    created := created + 1;
+                END IF;
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
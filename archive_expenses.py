@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Archive closed expenses for Odoo Expense Management
+
+Moves approved/rejected expenses older than the retention window from the hot
+`expenses` table into `expenses_archive` in batches. Safe to run from cron and
+concurrently with the API; archived expenses stay readable via
+GET /api/expenses/{id}.
+
+Usage:
+    python archive_expenses.py [--retention-days 365] [--batch-size 1000] [--max-batches N]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.backend.app.utils.app.database import SessionLocal
+from src.backend.app.utils.app.config import settings
+from src.backend.app.services.archive_service import archive_closed_expenses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive closed expenses")
+    parser.add_argument("--retention-days", type=int, default=settings.expense_archive_retention_days)
+    parser.add_argument("--batch-size", type=int, default=settings.expense_archive_batch_size)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"🗄️  Archiving expenses closed more than {args.retention_days} days ago...")
+    db = SessionLocal()
+    try:
+        archived = archive_closed_expenses(
+            db,
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+        print(f"✅ Archived {archived} expense(s)")
+    except Exception as e:
+        print(f"❌ Archiving failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
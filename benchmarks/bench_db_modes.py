@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sync (threadpool) vs async (asyncpg) database mode
+
+Fires --requests calls per endpoint with --concurrency in flight against the
+app in-process (httpx ASGI transport), once with DATABASE_ASYNC_MODE=false and
+once with true, each in a fresh interpreter since the mode is chosen at import.
+--threadpool caps the sync workers the way a busy server's threadpool would.
+
+Endpoints (--endpoints):
+    expenses    GET /api/expenses/by-employee/{id}   unauthenticated read
+    users       GET /api/users/?limit=50             authenticated directory page
+    managers    GET /api/users/managers              authenticated read
+    me          GET /api/auth/me                     authentication only (cached user)
+
+Authenticated endpoints use a token for --user-id (default: the first active
+admin, e.g. from seed_db.py). Requires a reachable PostgreSQL (DATABASE_URL).
+
+Usage:
+    python benchmarks/bench_db_modes.py [--requests 2000] [--concurrency 200] [--threadpool 40]
+    python benchmarks/bench_db_modes.py --endpoints users me --user-id <admin uuid>
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+
+ENDPOINTS = {
+    "expenses": "/api/expenses/by-employee/{employee_id}",
+    "users": "/api/users/?limit=50",
+    "managers": "/api/users/managers",
+    "me": "/api/auth/me",
+}
+AUTHENTICATED = {"users", "managers", "me"}
+
+
+def bench_user_id(args) -> str:
+    """--user-id, or the first active admin in the database"""
+    if args.user_id:
+        return args.user_id
+    from sqlalchemy import select
+    from src.backend.app.models.user import User
+    from src.backend.app.utils.app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_id = db.scalar(select(User.id).where(User.role == "admin", User.is_active == True).limit(1))
+    finally:
+        db.close()
+    if user_id is None:
+        raise SystemExit("No active admin found: seed the database (seed_db.py) or pass --user-id")
+    return str(user_id)
+
+
+async def run_endpoint(client, url: str, headers: dict, args) -> dict:
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    await client.get(url, headers=headers)  # warm up the pool and caches
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests_per_s": round(args.requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "errors": errors,
+    }
+
+
+async def run_mode(args) -> dict:
+    import anyio.to_thread
+    import httpx
+    from src.backend.app.utils.app import create_app
+    from src.backend.app.utils.app.utils.auth import create_access_token
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+    app = create_app()
+    auth_headers = {}
+    if AUTHENTICATED.intersection(args.endpoints):
+        auth_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': bench_user_id(args)})}"}
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for endpoint in args.endpoints:
+            url = ENDPOINTS[endpoint].format(employee_id=args.employee_id)
+            headers = auth_headers if endpoint in AUTHENTICATED else {}
+            results[endpoint] = await run_endpoint(client, url, headers, args)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threadpool", type=int, default=40)
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--employee-id", default=str(uuid.uuid4()))
+    parser.add_argument("--user-id", help="User the authenticated endpoints run as (default: first active admin)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_mode(args))))
+        return
+
+    results = {}
+    print(f"🗄️  {args.requests} requests, {args.concurrency} concurrent, threadpool {args.threadpool}")
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        child = subprocess.run(
+            [sys.executable, __file__, "--child", *sys.argv[1:], "--employee-id", args.employee_id],
+            env={**os.environ, "DATABASE_ASYNC_MODE": flag},
+            capture_output=True, text=True,
+        )
+        if child.returncode != 0:
+            print(f"❌ {mode} mode failed:\n{child.stderr.strip().splitlines()[-1] if child.stderr else ''}")
+            continue
+        results[mode] = json.loads(child.stdout.strip().splitlines()[-1])
+        for endpoint, r in results[mode].items():
+            print(f"{mode:<6}{endpoint:<10}{r['requests_per_s']:>10} req/s   p50 {r['p50_ms']:>8} ms   "
+                  f"p99 {r['p99_ms']:>8} ms   errors {r['errors']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
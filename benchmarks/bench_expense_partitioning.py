@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark: partitioned vs unpartitioned expenses layout
+
+Builds two copies of the expenses layout in a scratch schema - a single heap
+and a monthly range-partitioned table - fills them with the same synthetic rows
+(generated server-side with generate_series) and compares query and VACUUM
+timings for the access patterns used by the expenses router.
+
+Usage:
+    python benchmarks/bench_expense_partitioning.py --rows 50000000
+    python benchmarks/bench_expense_partitioning.py --rows 1000000 --keep
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, text
+from src.backend.app.utils.app.config import settings
+
+COLUMNS_DDL = """
+    id uuid NOT NULL DEFAULT gen_random_uuid(),
+    company_id uuid NOT NULL,
+    employee_id uuid NOT NULL,
+    description text NOT NULL,
+    category varchar(80),
+    expense_date date,
+    amount numeric(20,2) NOT NULL DEFAULT 0,
+    currency_code varchar(3) NOT NULL DEFAULT 'INR',
+    status varchar(20) NOT NULL DEFAULT 'draft',
+    created_at timestamp NOT NULL,
+    updated_at timestamp NOT NULL
+"""
+
+# Queries mirroring the expenses router; :employee/:company are picked from the data.
+QUERIES = {
+    "employee_last_30_days": """
+        SELECT * FROM {table}
+        WHERE employee_id = :employee AND created_at >= :now - interval '30 days'
+        ORDER BY created_at DESC
+    """,
+    "company_status_one_month": """
+        SELECT count(*), sum(amount) FROM {table}
+        WHERE company_id = :company AND status = 'approved'
+          AND created_at >= :month_start AND created_at < :month_start + interval '1 month'
+    """,
+    "all_rows_one_month": """
+        SELECT currency_code, sum(amount) FROM {table}
+        WHERE created_at >= :month_start AND created_at < :month_start + interval '1 month'
+        GROUP BY currency_code
+    """,
+}
+
+
+def create_tables(conn, schema: str, months: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {schema}"))
+
+    conn.execute(text(f"CREATE TABLE {schema}.expenses_flat ({COLUMNS_DDL}, PRIMARY KEY (id))"))
+    conn.execute(text(
+        f"CREATE TABLE {schema}.expenses_part ({COLUMNS_DDL}, PRIMARY KEY (id, created_at)) "
+        f"PARTITION BY RANGE (created_at)"
+    ))
+    for i in range(months + 1):
+        conn.execute(text(f"""
+            DO $$
+            DECLARE m date := (date_trunc('month', now()) - make_interval(months => {months - i}))::date;
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE {schema}.%I PARTITION OF {schema}.expenses_part FOR VALUES FROM (%L) TO (%L)',
+                    'expenses_part_' || to_char(m, 'YYYYMM'), m, (m + interval '1 month')::date
+                );
+            END $$;
+        """))
+
+
+def load_rows(conn, schema: str, rows: int, months: int, companies: int, employees: int) -> float:
+    start = time.perf_counter()
+    conn.execute(text(f"""
+        INSERT INTO {schema}.expenses_flat
+            (company_id, employee_id, description, category, expense_date, amount,
+             currency_code, status, created_at, updated_at)
+        SELECT
+            md5('company' || (g % {companies}))::uuid,
+            md5('employee' || (g % {employees}))::uuid,
+            'Expense ' || g,
+            (ARRAY['travel','meals','lodging','supplies','other'])[1 + g % 5],
+            ts::date,
+            round((random() * 500)::numeric, 2),
+            (ARRAY['INR','USD','EUR','GBP'])[1 + g % 4],
+            (ARRAY['draft','submitted','waiting-approval','approved','rejected'])[1 + g % 5],
+            ts, ts
+        FROM (
+            -- random() in the select list of a subquery over g: one timestamp per row
+            -- (an uncorrelated LATERAL may be evaluated once for the whole insert)
+            SELECT g, date_trunc('month', now()) - make_interval(months => {months})
+                      + random() * (now() - (date_trunc('month', now()) - make_interval(months => {months}))) AS ts
+            FROM generate_series(1, {rows}) AS g
+        ) AS t
+    """))
+    conn.execute(text(f"INSERT INTO {schema}.expenses_part SELECT * FROM {schema}.expenses_flat"))
+    for table in ("expenses_flat", "expenses_part"):
+        conn.execute(text(f"CREATE INDEX ON {schema}.{table} (company_id, status)"))
+        conn.execute(text(f"CREATE INDEX ON {schema}.{table} (employee_id, created_at DESC)"))
+        conn.execute(text(f"ANALYZE {schema}.{table}"))
+    return time.perf_counter() - start
+
+
+def partitions_filled(conn, schema: str) -> int:
+    """Number of partitions of expenses_part that received rows"""
+    return conn.execute(text(f"SELECT count(DISTINCT tableoid) FROM {schema}.expenses_part")).scalar()
+
+
+def explain(conn, sql: str, params: dict) -> tuple[float, int]:
+    """Returns (execution time in ms, number of relations scanned)"""
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()[0]
+
+    def count_scans(node):
+        own = 1 if "Relation Name" in node else 0
+        return own + sum(count_scans(child) for child in node.get("Plans", []))
+
+    return plan["Execution Time"], count_scans(plan["Plan"])
+
+
+def run_queries(conn, schema: str, repeat: int) -> dict:
+    sample = conn.execute(text(
+        f"SELECT company_id, employee_id FROM {schema}.expenses_flat LIMIT 1"
+    )).first()
+    params = {
+        "company": sample[0],
+        "employee": sample[1],
+        "now": conn.execute(text("SELECT now()::timestamp")).scalar(),
+        "month_start": conn.execute(text(
+            "SELECT (date_trunc('month', now()) - interval '2 months')::timestamp"
+        )).scalar(),
+    }
+
+    results = {}
+    for name, sql in QUERIES.items():
+        results[name] = {}
+        for table in ("expenses_flat", "expenses_part"):
+            timings, scanned = [], 0
+            for _ in range(repeat):
+                ms, scanned = explain(conn, sql.format(table=f"{schema}.{table}"), params)
+                timings.append(ms)
+            results[name][table] = {
+                "median_ms": round(statistics.median(timings), 3),
+                "relations_scanned": scanned,
+            }
+    return results
+
+
+def time_vacuum(conn, schema: str) -> dict:
+    timings = {}
+    latest = conn.execute(text(f"""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = p.relnamespace
+        WHERE n.nspname = :schema AND p.relname = 'expenses_part'
+        ORDER BY c.relname DESC LIMIT 1
+    """), {"schema": schema}).scalar()
+    for label, table in (("expenses_flat", "expenses_flat"), ("latest_partition", latest)):
+        start = time.perf_counter()
+        conn.execute(text(f"VACUUM (ANALYZE) {schema}.{table}"))
+        timings[label] = round((time.perf_counter() - start) * 1000, 1)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--months", type=int, default=36, help="History spread across this many months")
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--schema", default="bench_partitioning")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        print(f"🏗️  Building {args.rows:,} rows in schema '{args.schema}'...")
+        create_tables(conn, args.schema, args.months)
+        load_seconds = load_rows(conn, args.schema, args.rows, args.months, args.companies, args.employees)
+        filled = partitions_filled(conn, args.schema)
+        print(f"✅ Loaded in {load_seconds:.1f}s across {filled} of {args.months + 1} partitions")
+        if filled < min(args.rows, args.months + 1) // 2:
+            print("⚠️  Rows are concentrated in few partitions: the comparison is not representative")
+
+        results = {
+            "rows": args.rows,
+            "months": args.months,
+            "partitions_filled": filled,
+            "queries": run_queries(conn, args.schema, args.repeat),
+            "vacuum_ms": time_vacuum(conn, args.schema),
+        }
+
+        if not args.keep:
+            conn.execute(text(f"DROP SCHEMA {args.schema} CASCADE"))
+
+    print(f"\n{'query':<28}{'flat ms':>12}{'part ms':>12}{'flat rels':>11}{'part rels':>11}")
+    for name, r in results["queries"].items():
+        flat, part = r["expenses_flat"], r["expenses_part"]
+        print(f"{name:<28}{flat['median_ms']:>12}{part['median_ms']:>12}"
+              f"{flat['relations_scanned']:>11}{part['relations_scanned']:>11}")
+    print(f"\nVACUUM whole heap: {results['vacuum_ms']['expenses_flat']} ms, "
+          f"latest partition: {results['vacuum_ms']['latest_partition']} ms")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2, default=str))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
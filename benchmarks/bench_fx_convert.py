@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized batch currency conversion
+
+Fills an FxRateStore with a year of daily snapshots (stub rates with noise) and
+times FxRateStore.convert_batch over N random rows, with and without per-row
+dates, against the per-value loop it replaces.
+
+Usage:
+    python benchmarks/bench_fx_convert.py [--rows 1000000] [--days 365]
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.services.fx_service import FxRateStore, StubFxSource
+
+
+def build_store(days: int, rng: np.random.Generator) -> FxRateStore:
+    store = FxRateStore("USD")
+    start = date.today() - timedelta(days=days - 1)
+    for offset in range(days):
+        noise = rng.normal(1.0, 0.01, len(StubFxSource.RATES))
+        store.add_snapshot(
+            start + timedelta(days=offset),
+            {code: rate * n for (code, rate), n in zip(StubFxSource.RATES.items(), noise)},
+        )
+    return store
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target", default="INR")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    store = build_store(args.days, rng)
+
+    codes = np.array(list(StubFxSource.RATES))
+    sources = codes[rng.integers(0, len(codes), args.rows)]
+    amounts = np.round(rng.lognormal(4, 1.2, args.rows), 2)
+    dates = np.datetime64(date.today()) - rng.integers(0, args.days, args.rows)
+
+    # Reference: the scalar per-value conversion on a sample, extrapolated
+    sample = min(args.rows, 20_000)
+    sample_sources, sample_amounts = sources[:sample].tolist(), amounts[:sample].tolist()
+
+    def scalar_loop():
+        for amount, source in zip(sample_amounts, sample_sources):
+            round(amount * store.rate(source, args.target), 2)
+
+    results = {
+        "rows": args.rows,
+        "vectorized_latest_s": best_of(args.repeat, lambda: store.convert_batch(amounts, sources, args.target)),
+        "vectorized_dated_s": best_of(args.repeat, lambda: store.convert_batch(amounts, sources, args.target, dates)),
+        "vectorized_from_lists_s": best_of(
+            1, lambda: store.convert_batch(amounts.tolist(), sources.tolist(), args.target)
+        ),
+        "scalar_loop_extrapolated_s": best_of(args.repeat, scalar_loop) * args.rows / sample,
+    }
+
+    for name, value in results.items():
+        print(f"{name:<30}{value:>12.4f}" if name != "rows" else f"{name:<30}{value:>12,}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call vs shared pooled HTTP client for CountryService
+
+Starts a local keep-alive HTTP stub that mimics the exchange rate API, then
+measures p50/p99 latency of exchange rate fetches made
+  - the old way: a new httpx.AsyncClient (and connection) per call
+  - through CountryService's shared, pooled client
+
+Usage:
+    python benchmarks/bench_http_client.py [--requests 2000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.services.country_service import CountryService
+
+STUB_BODY = json.dumps({
+    "base": "USD",
+    "date": "2026-01-01",
+    "rates": {code: 1.0 + i / 100 for i, code in enumerate(["USD", "EUR", "GBP", "INR", "JPY", "CAD", "AUD"])},
+}).encode()
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal HTTP/1.1 responder that honours keep-alive"""
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if not request:
+                break
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(STUB_BODY)).encode() + b"\r\n"
+                b"\r\n" + STUB_BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def _summary(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "requests_per_sec": round(len(ordered) / elapsed, 1),
+    }
+
+
+async def _run(fetch, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return _summary(latencies, time.perf_counter() - start)
+
+
+async def main_async(args) -> dict:
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/v4/latest"
+
+    async def per_call_client():
+        # Behaviour before the shared client: new client + connection per call
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{base_url}/USD", timeout=10.0)
+            response.raise_for_status()
+            response.json()
+
+    service = CountryService()
+    service.EXCHANGE_API = base_url
+    await service.startup()
+
+    async def shared_client():
+        rates = await service.get_exchange_rates("USD")
+        assert "error" not in rates, rates
+
+    results = {}
+    async with server:
+        for name, fetch in (("per_call_client", per_call_client), ("shared_client", shared_client)):
+            await _run(fetch, min(100, args.requests), args.concurrency)  # warm-up
+            results[name] = await _run(fetch, args.requests, args.concurrency)
+    await service.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+
+    print(f"{'mode':<18}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['mean_ms']:>10}{r['requests_per_sec']:>10}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
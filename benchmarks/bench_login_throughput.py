@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: password verification throughput (logins per second)
+
+Simulates a login storm: --threads request threads (FastAPI's threadpool) each
+verify bcrypt hashes back to back. Runs once with hashing inline in the request
+threads and once per --workers value on the PasswordHasher process pool, and
+reports logins/s, latency percentiles and how many requests were shed (503).
+
+Usage:
+    python benchmarks/bench_login_throughput.py [--logins 200] [--threads 40] [--workers 2 4]
+    python benchmarks/bench_login_throughput.py --calibrate 250   # suggest bcrypt_rounds
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.services.password_service import PasswordHasher, PasswordHasherBusy, calibrate_rounds
+
+
+def run(hasher: PasswordHasher, password_hash: str, logins: int, threads: int) -> dict:
+    latencies, rejected = [], 0
+
+    def login(_):
+        start = time.perf_counter()
+        try:
+            hasher.verify("correct horse battery staple", password_hash)
+        except PasswordHasherBusy:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for latency in pool.map(login, range(logins)):
+            if latency is None:
+                rejected += 1
+            else:
+                latencies.append(latency)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "logins_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "rejected": rejected,
+        "peak_pending": hasher.stats()["peak_pending"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--max-queue", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--calibrate", type=float, metavar="TARGET_MS", help="Print the bcrypt cost for a latency target")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        print(f"🔧 bcrypt_rounds={calibrate_rounds(args.calibrate)} keeps one hash under {args.calibrate:g} ms here")
+        return
+
+    password_hash = PasswordHasher(0, 0, args.rounds).hash("correct horse battery staple")
+    results = {}
+
+    print(f"🔐 {args.logins} logins from {args.threads} threads, bcrypt cost {args.rounds}")
+    for workers in [0] + args.workers:
+        hasher = PasswordHasher(workers, args.max_queue, args.rounds)
+        hasher.startup()
+        name = "inline" if workers == 0 else f"pool_{workers}"
+        results[name] = run(hasher, password_hash, args.logins, args.threads)
+        hasher.shutdown()
+        r = results[name]
+        print(f"{name:<10}{r['logins_per_s']:>10} logins/s   p50 {r['p50_ms']:>8} ms   "
+              f"p99 {r['p99_ms']:>8} ms   rejected {r['rejected']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: get_current_user with and without the verified-token cache
+
+Calls the get_current_user dependency directly with a warm user cache (so no
+database is needed) and compares full JWT verification on every call against
+the digest-keyed claims cache.
+
+Usage:
+    python benchmarks/bench_token_cache.py [--calls 20000]
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.models.company import Company
+from src.backend.app.models.user import User
+from src.backend.app.services.token_revocation import revocation_store
+from src.backend.app.utils.app.utils import auth
+from src.backend.app.utils.app.utils.user_cache import cache_user
+
+
+def make_user() -> User:
+    now = datetime.utcnow()
+    company = Company(name="Bench Co", email="bench@example.com", country_code="IN")
+    company.id, company.is_active, company.created_at, company.updated_at = uuid.uuid4(), True, now, now
+    user = inspect(User).class_manager.new_instance()  # skips __init__ (no password hashing)
+    user.id, user.email, user.password_hash = uuid.uuid4(), "bench@example.com", "x"
+    user.first_name, user.last_name, user.role, user.is_active = "Bench", "User", "admin", True
+    user.company_id, user.manager_id, user.created_at, user.updated_at = company.id, None, now, now
+    user.company = company
+    return user
+
+
+def time_calls(calls: int, credentials, clear_each_call: bool) -> float:
+    db = Session()
+    start = time.perf_counter()
+    for _ in range(calls):
+        if clear_each_call:
+            auth.clear_token_cache()
+        auth.get_current_user(credentials, db)
+        db.expunge_all()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    user = make_user()
+    cache_user(user)
+    revocation_store.load([])  # empty revocation filter: no database lookups
+    token = auth.create_access_token(data={"sub": str(user.id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    uncached = time_calls(args.calls, credentials, clear_each_call=True)
+    auth.clear_token_cache()
+    cached = time_calls(args.calls, credentials, clear_each_call=False)
+
+    results = {
+        "calls": args.calls,
+        "uncached_us_per_call": round(uncached / args.calls * 1e6, 2),
+        "cached_us_per_call": round(cached / args.calls * 1e6, 2),
+        "speedup": round(uncached / cached, 2),
+        "cache": auth.token_cache_stats(),
+    }
+    print(f"🔑 get_current_user x{args.calls}")
+    print(f"   full jwt.decode : {results['uncached_us_per_call']:>8} µs/call")
+    print(f"   token cache     : {results['cached_us_per_call']:>8} µs/call  ({results['speedup']}x)")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
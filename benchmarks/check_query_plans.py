@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Check: the router queries are served by their indexes
+
+Seeds synthetic companies, users and expenses (server-side, generate_series),
+ANALYZEs them, then runs the real query code of each endpoint - router
+functions and services where the query lives there, the same ORM query where
+it is inline in a router - captures the SQL it sends and EXPLAINs it. A case
+fails if the plan seq-scans one of its tables or uses none of the indexes
+expected for it (see alembic/versions/0005_* and 0007_*). Everything runs in
+one transaction that is rolled back, so the database is left as it was.
+Requires a PostgreSQL migrated to head (DATABASE_URL). Exits non-zero on failure.
+
+Usage:
+    python benchmarks/check_query_plans.py [--companies 20] [--users-per-company 1000]
+    python benchmarks/check_query_plans.py --verbose   # print every plan
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import joinedload
+from src.backend.app.api.routers.users import get_managers
+from src.backend.app.models.company import Company
+from src.backend.app.models.expense import Expense
+from src.backend.app.models.user import User
+from src.backend.app.services.archive_service import _ARCHIVE_BATCH_SQL
+from src.backend.app.services.company_stats import _load_user_counts
+from src.backend.app.services.user_directory import list_users
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import SessionLocal
+
+SEED_PREFIX = "plan-check-"
+
+SEED_SQL = [
+    """
+    INSERT INTO companies (name, email, country_code, currency_code)
+    SELECT 'Plan check ' || g, :prefix || g || '@example.invalid', 'IN', 'INR'
+    FROM generate_series(1, :companies) g
+    """,
+    """
+    INSERT INTO users (email, password_hash, first_name, last_name, is_active, role, company_id)
+    SELECT :prefix || c.id || '-' || g || '@example.invalid',
+           'x',
+           initcap(substr(md5('f' || g), 1, 6)),
+           initcap(substr(md5('l' || c.id || g), 1, 8)),
+           g % 10 <> 0,
+           CASE WHEN g = 1 THEN 'admin' WHEN g % 20 = 0 THEN 'manager' ELSE 'employee' END,
+           c.id
+    FROM companies c, generate_series(1, :users) g
+    WHERE c.email LIKE :prefix || '%'
+    """,
+    """
+    UPDATE users u SET manager_id = m.ids[1 + abs(hashtext(u.id::text)) % array_length(m.ids, 1)]
+    FROM (
+        SELECT company_id, array_agg(id) AS ids FROM users
+        WHERE role = 'manager' AND email LIKE :prefix || '%'
+        GROUP BY company_id
+    ) m
+    WHERE u.company_id = m.company_id AND u.role = 'employee' AND u.email LIKE :prefix || '%'
+    """,
+    """
+    INSERT INTO expenses (company_id, employee_id, description, amount, status, created_at, updated_at)
+    SELECT u.company_id, u.id, 'Plan check expense', 10 + g,
+           (ARRAY['draft', 'submitted', 'waiting-approval', 'approved', 'rejected'])[1 + g % 5],
+           t.created_at, t.created_at + (g % 30) * interval '1 day'
+    FROM users u, generate_series(1, :expenses) g,
+         LATERAL (SELECT now() - (abs(hashtext(u.id::text || g)) % 720) * interval '1 day' AS created_at) t
+    WHERE u.email LIKE :prefix || '%' AND u.is_active
+    """,
+]
+
+
+def seed(db, companies: int, users: int, expenses: int) -> None:
+    params = {"prefix": SEED_PREFIX, "companies": companies, "users": users, "expenses": expenses}
+    for statement in SEED_SQL:
+        db.execute(text(statement), params)
+    db.execute(text("ANALYZE companies"))
+    db.execute(text("ANALYZE users"))
+    db.execute(text("ANALYZE expenses"))
+
+
+def capture(db, run) -> list:
+    """SELECT/WITH statements (with parameters) sent to the database while `run()` executes"""
+    connection = db.connection()
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def matches_index(index_name: str, expected: str) -> bool:
+    # Partition indexes of expenses_* are named expenses_<partition>_*
+    return index_name == expected or (
+        expected.startswith("expenses_") and index_name.endswith(expected[len("expenses"):])
+    )
+
+
+def build_cases(db) -> list:
+    company_id = db.execute(
+        select(Company.id).where(Company.email.like(f"{SEED_PREFIX}%")).order_by(Company.email).limit(1)
+    ).scalar()
+    admin = db.query(User).filter(User.company_id == company_id, User.role == "admin").first()
+    manager = db.query(User).filter(User.company_id == company_id, User.role == "manager").first()
+    employee = db.query(User).filter(User.company_id == company_id, User.manager_id.isnot(None)).first()
+    company_email = db.execute(select(Company.email).where(Company.id == company_id)).scalar()
+    archive_cutoff = datetime.utcnow() - timedelta(days=settings.expense_archive_retention_days)
+
+    def savepoint(statement, params):
+        nested = db.begin_nested()
+        try:
+            db.execute(statement, params)
+        finally:
+            nested.rollback()
+
+    # (name, tables that must not be seq-scanned, acceptable indexes, code to run)
+    return [
+        (
+            "login: user by email", {"users"}, {"users_email_key", "ix_users_email"},
+            lambda: db.query(User).options(joinedload(User.company)).filter(User.email == employee.email).first(),
+        ),
+        (
+            "signup: company by email", {"companies"}, {"companies_email_key"},
+            lambda: db.query(Company).filter(Company.email == company_email).first(),
+        ),
+        (
+            "GET /api/companies/stats", {"users"}, {"users_company_active_role_idx"},
+            lambda: _load_user_counts(db, company_id),
+        ),
+        (
+            "GET /api/users/managers", {"users"}, {"users_company_active_role_idx"},
+            lambda: get_managers(current_user=admin, db=db),
+        ),
+        (
+            "GET /api/users/ (first page)", {"users"}, {"users_company_name_idx"},
+            lambda: list_users(db, company_id, 50),
+        ),
+        (
+            "GET /api/users/?manager_id=", {"users"}, {"users_manager_name_idx"},
+            lambda: list_users(db, company_id, 50, manager_id=manager.id),
+        ),
+        (
+            "GET /api/users/?q= (prefix)", {"users"},
+            {
+                "users_company_name_idx", "users_email_prefix_idx",
+                "users_first_name_prefix_idx", "users_last_name_prefix_idx",
+            },
+            lambda: list_users(db, company_id, 50, q=employee.last_name[:3]),
+        ),
+        (
+            "GET /api/expenses/by-employee/{id}", {"expenses"}, {"expenses_employee_created_idx"},
+            lambda: db.execute(
+                select(Expense).where(Expense.employee_id == employee.id).order_by(Expense.created_at.desc())
+            ).all(),
+        ),
+        (
+            "archive job batch", {"expenses"}, {"expenses_closed_created_idx"},
+            lambda: savepoint(_ARCHIVE_BATCH_SQL, {"cutoff": archive_cutoff, "batch_size": 1000}),
+        ),
+    ]
+
+
+def check_case(db, name, tables, expected, run, verbose: bool) -> dict:
+    statements = capture(db, run)
+    connection = db.connection()
+    seq_scans, indexes = set(), set()
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        if verbose:
+            print(f"\n-- {name}\n{statement}\n{json.dumps(plan, indent=2)}")
+        for node in plan_nodes(plan[0]["Plan"]):
+            relation = node.get("Relation Name", "")
+            if node["Node Type"] == "Seq Scan" and any(
+                relation == table or relation.startswith(f"{table}_") for table in tables
+            ):
+                seq_scans.add(relation)
+            if "Index Name" in node:
+                indexes.add(node["Index Name"])
+
+    if seq_scans:
+        # Empty partitions (future months) are seq-scanned at no cost
+        seq_scans = set(connection.execute(
+            text("SELECT relname FROM pg_class WHERE relname = ANY(:names) AND reltuples > 0"),
+            {"names": sorted(seq_scans)},
+        ).scalars())
+    used = sorted(i for i in indexes if any(matches_index(i, e) for e in expected))
+    ok = bool(statements) and not seq_scans and bool(used)
+    return {
+        "ok": ok,
+        "statements": len(statements),
+        "indexes": sorted(indexes),
+        "seq_scans": sorted(seq_scans),
+        "expected": sorted(expected),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--users-per-company", type=int, default=1000)
+    parser.add_argument("--expenses-per-user", type=int, default=10)
+    parser.add_argument("--verbose", action="store_true", help="Print every captured statement and plan")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    results = {}
+    try:
+        print(f"🌱 Seeding {args.companies} companies x {args.users_per_company} users "
+              f"x {args.expenses_per_user} expenses (rolled back afterwards)...")
+        seed(db, args.companies, args.users_per_company, args.expenses_per_user)
+
+        for name, tables, expected, run in build_cases(db):
+            result = check_case(db, name, tables, expected, run, args.verbose)
+            results[name] = result
+            if result["ok"]:
+                print(f"✅ {name}: {', '.join(result['indexes'])}")
+            else:
+                problems = []
+                if result["seq_scans"]:
+                    problems.append(f"seq scan on {', '.join(result['seq_scans'])}")
+                problems.append(f"indexes used: {', '.join(result['indexes']) or 'none'}")
+                print(f"❌ {name}: {'; '.join(problems)} (expected one of {', '.join(result['expected'])})")
+    finally:
+        db.rollback()
+        db.close()
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+    if not results or not all(result["ok"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
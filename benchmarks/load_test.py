@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Load test: end-to-end throughput and latency of the main API flows
+
+Drives the create_app() ASGI app in process (httpx ASGI transport, lifespan
+included) or, with --loopback, a uvicorn server started on 127.0.0.1 (--url
+points at one that is already running). Each scenario sends --requests
+requests with --concurrency in flight and reports requests/s and p50/p95/p99
+latency:
+
+    signup          POST /api/auth/signup (new company + admin each time)
+    login           POST /api/auth/login
+    me              GET  /api/auth/me
+    users_list      GET  /api/users/?limit=50
+    company_stats   GET  /api/companies/stats
+    ocr_upload      POST /api/expenses/ocr-upload (fake OCR engine)
+    expense_update  PUT  /api/expenses/{id}
+
+A setup phase signs up --accounts companies and uploads one receipt each; the
+scenarios reuse those. OCR runs with OCR_ENGINE=fake (--ocr-latency-ms of
+simulated work) and the login/signup rate limits are off unless
+--keep-rate-limits. Requires a migrated PostgreSQL (DATABASE_URL); the rows
+created are left in place (emails under @loadtest-<run>.example.com).
+
+--json saves the results; --baseline compares with a saved run and exits
+non-zero when a scenario's p95 grew or its throughput fell by more than
+--max-regression.
+
+Usage:
+    python benchmarks/load_test.py [--requests 500] [--concurrency 50] [--json results.json]
+    python benchmarks/load_test.py --loopback --workers 4 --scenarios login me ocr_upload
+    python benchmarks/load_test.py --baseline release-1.2.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+PASSWORD = "LoadTest123!"
+
+
+def receipt_png() -> bytes:
+    """A small blank receipt image (decoded only by a real OCR engine)"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (200, 300), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+RECEIPT_PNG = receipt_png()
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class LoadContext:
+    """Accounts and expenses created during setup, shared by the scenarios"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.accounts = []  # dicts: email, access_token, user_id, company_id
+        self.expense_ids = []
+        self._signups = 0
+
+    def new_signup(self) -> dict:
+        self._signups += 1
+        number = self._signups
+        return {
+            "email": f"admin{number}@loadtest-{self.run_id}.example.com",
+            "password": PASSWORD,
+            "first_name": "Load",
+            "last_name": "Tester",
+            "company_name": f"Load Test {self.run_id} #{number}",
+            "company_email": f"company{number}@loadtest-{self.run_id}.example.com",
+            "country_code": "IN",
+        }
+
+    def account(self, i: int) -> dict:
+        return self.accounts[i % len(self.accounts)]
+
+    def auth(self, i: int) -> dict:
+        return {"Authorization": f"Bearer {self.account(i)['access_token']}"}
+
+
+async def signup(client: httpx.AsyncClient, ctx: LoadContext, i: int) -> httpx.Response:
+    return await client.post("/api/auth/signup", json=ctx.new_signup())
+
+
+async def login(client, ctx, i):
+    return await client.post("/api/auth/login", json={"email": ctx.account(i)["email"], "password": PASSWORD})
+
+
+async def me(client, ctx, i):
+    return await client.get("/api/auth/me", headers=ctx.auth(i))
+
+
+async def users_list(client, ctx, i):
+    return await client.get("/api/users/", params={"limit": 50}, headers=ctx.auth(i))
+
+
+async def company_stats(client, ctx, i):
+    return await client.get("/api/companies/stats", headers=ctx.auth(i))
+
+
+async def ocr_upload(client, ctx, i):
+    account = ctx.account(i)
+    return await client.post(
+        "/api/expenses/ocr-upload",
+        files={"file": ("receipt.png", io.BytesIO(RECEIPT_PNG), "image/png")},
+        data={"employee_id": account["user_id"], "company_id": account["company_id"]},
+    )
+
+
+async def expense_update(client, ctx, i):
+    expense_id = ctx.expense_ids[i % len(ctx.expense_ids)]
+    return await client.put(
+        f"/api/expenses/{expense_id}",
+        json={"remarks": f"load test update {i}", "amount": 100 + i % 900, "status": "submitted"},
+    )
+
+
+SCENARIOS = {
+    "signup": signup,
+    "login": login,
+    "me": me,
+    "users_list": users_list,
+    "company_stats": company_stats,
+    "ocr_upload": ocr_upload,
+    "expense_update": expense_update,
+}
+
+
+async def run_requests(client, ctx, fn, requests: int, concurrency: int) -> dict:
+    latencies, statuses = [], {}
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await fn(client, ctx, i)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = e.__class__.__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "errors": errors,
+        "statuses": statuses,
+    }
+
+
+async def setup(client: httpx.AsyncClient, ctx: LoadContext, accounts: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create_account():
+        async with semaphore:
+            response = await signup(client, ctx, 0)
+            if response.status_code != 201:
+                raise RuntimeError(f"signup failed ({response.status_code}): {response.text[:200]}")
+            body = response.json()
+            account = {
+                "email": body["user"]["email"],
+                "access_token": body["access_token"],
+                "user_id": str(body["user"]["id"]),
+                "company_id": str(body["company"]["id"]),
+            }
+            ctx.accounts.append(account)
+            response = await ocr_upload(client, ctx, len(ctx.accounts) - 1)
+            if response.status_code != 200:
+                raise RuntimeError(f"OCR upload failed ({response.status_code}): {response.text[:200]}")
+            ctx.expense_ids.append(response.json()["expense"]["id"])
+
+    await asyncio.gather(*(create_account() for _ in range(accounts)))
+
+
+async def run_all(args, client: httpx.AsyncClient) -> dict:
+    ctx = LoadContext(uuid.uuid4().hex[:8])
+    print(f"🔧 Setting up {args.accounts} accounts (run {ctx.run_id})...")
+    await setup(client, ctx, args.accounts, min(args.concurrency, 20))
+
+    results = {}
+    for name in args.scenarios:
+        scenario = SCENARIOS[name]
+        await run_requests(client, ctx, scenario, min(args.warmup, args.requests), args.concurrency)
+        result = await run_requests(client, ctx, scenario, args.requests, args.concurrency)
+        results[name] = result
+        print(f"{name:<16}{result['requests_per_s']:>9} req/s   p50 {result['p50_ms']:>8} ms   "
+              f"p95 {result['p95_ms']:>8} ms   p99 {result['p99_ms']:>8} ms   errors {result['errors']}")
+    return results
+
+
+async def run_in_process(args) -> dict:
+    from src.backend.app.utils.app import create_app
+
+    app = create_app()
+    # httpx's ASGI transport does not send lifespan events: run startup/shutdown here
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            return await run_all(args, client)
+
+
+async def run_over_http(args, url: str) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        return await run_all(args, client)
+
+
+def start_server(args) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    server = subprocess.Popen(command, cwd=project_root, env=os.environ.copy())
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{args.port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: str, max_regression: float) -> bool:
+    """Print changes against a saved run; False if any scenario regressed beyond the limit"""
+    baseline = json.loads(Path(baseline_path).read_text())["scenarios"]
+    ok = True
+    print(f"\n📊 Compared with {baseline_path} (limit {max_regression:.0%})")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rps_change = result["requests_per_s"] / before["requests_per_s"] - 1 if before["requests_per_s"] else 0.0
+        regressed = p95_change > max_regression or rps_change < -max_regression
+        ok = ok and not regressed
+        print(f"{'❌' if regressed else '✅'} {name:<16} p95 {p95_change:+.1%}   req/s {rps_change:+.1%}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each scenario")
+    parser.add_argument("--accounts", type=int, default=20, help="Companies/admins created during setup")
+    parser.add_argument("--ocr-latency-ms", type=int, default=50, help="Simulated OCR work per upload")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Leave login/signup rate limiting on")
+    parser.add_argument("--url", help="Load an already running server instead of the in-process app")
+    parser.add_argument("--loopback", action="store_true", help="Start uvicorn on 127.0.0.1 and load it over HTTP")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (--loopback)")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Read by the app's settings at import (in process) or by the server (loopback)
+    os.environ["OCR_ENGINE"] = "fake"
+    os.environ["OCR_FAKE_LATENCY_MS"] = str(args.ocr_latency_ms)
+    if not args.keep_rate_limits:
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    if args.url:
+        target = args.url
+        print(f"🌐 Loading {target} (server settings apply: OCR engine, rate limits)")
+        results = asyncio.run(run_over_http(args, target))
+    elif args.loopback:
+        target = f"http://127.0.0.1:{args.port}"
+        print(f"🌐 Starting uvicorn with {args.workers} worker(s) on {target}")
+        server = start_server(args)
+        try:
+            results = asyncio.run(run_over_http(args, target))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    else:
+        target = "in-process"
+        print("⚙️  Loading the ASGI app in process")
+        results = asyncio.run(run_in_process(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "git_revision": git_revision(),
+            "target": target,
+            "workers": args.workers if args.loopback else None,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "ocr_latency_ms": args.ocr_latency_ms,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "scenarios": results,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks: per-call cost of the service-level hot functions
+
+Times, in process and without a database:
+
+    parse_receipt_text/*               OCR text parsing (short, long and no-match receipts)
+    User.to_dict, Company.to_dict      model serialization
+    UserResponse.from_orm, ...         response schema construction
+    create_access_token                JWT signing
+    verify_token/cached, /uncached     claims cache hit vs full jwt.decode
+    get_currency_for_country/*         country registry lookups (known and unknown code)
+
+Each benchmark is calibrated to run at least --min-time seconds per repeat
+(timeit, GC disabled) and reports the best and median ns/call over --repeat
+repeats; the best is the figure compared between runs, being the least
+sensitive to other load on the machine.
+
+--json saves the results with run metadata; --baseline compares with a saved
+run and exits non-zero when a benchmark got slower by more than
+--max-regression. Compare runs from the same machine and Python version.
+
+Usage:
+    python benchmarks/microbench.py [--repeat 7] [--json microbench.json]
+    python benchmarks/microbench.py --filter verify_token to_dict
+    python benchmarks/microbench.py --baseline release-1.2.json --max-regression 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import inspect
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.models.company import Company
+from src.backend.app.models.user import User
+from src.backend.app.schemas.auth_schemas import CompanyResponse, UserResponse
+from src.backend.app.services.ocr_service import FAKE_RECEIPT_TEXT, parse_receipt_text
+from src.backend.app.utils.app.utils import auth
+
+LONG_RECEIPT_TEXT = "\n".join(
+    ["SPENCER'S RETAIL", "Forum Mall, Koramangala", "GSTIN 29AAACR1234F1Z5", "Bill No 004512  Date 04/10/2025"]
+    + [f"Item {i:02d} {'x' * (i % 12)}   {i} x {i * 7}.50" for i in range(1, 61)]
+    + ["Subtotal 12,345.00", "CGST 2.5% 308.63", "SGST 2.5% 308.63", "Grand Total INR 12,962.26", "Thank you!"]
+)
+
+# Worst case for the regexes: nothing to find, every pattern scans the whole text
+NO_MATCH_TEXT = "\n".join("lorem ipsum dolor sit amet consectetur adipiscing elit" for _ in range(40))
+
+
+def make_models():
+    now = datetime.utcnow()
+    company = Company(name="Bench Co", email="bench@example.com", country_code="IN", phone="+91 80 1234 5678",
+                      address="12 MG Road, Bengaluru")
+    company.id, company.is_active, company.created_at, company.updated_at = uuid.uuid4(), True, now, now
+    user = inspect(User).class_manager.new_instance()  # skips __init__ (no password hashing)
+    user.id, user.email, user.password_hash = uuid.uuid4(), "bench@example.com", "x"
+    user.first_name, user.last_name, user.role, user.is_active = "Bench", "User", "employee", True
+    user.company_id, user.manager_id, user.created_at, user.updated_at = company.id, uuid.uuid4(), now, now
+    user.company = company
+    return user, company
+
+
+def build_benchmarks() -> dict:
+    """Benchmark name -> zero-argument callable"""
+    user, company = make_models()
+    token = auth.create_access_token(data={"sub": str(user.id)})
+    auth.verify_token(token)  # warm the claims cache for verify_token/cached
+
+    def verify_uncached():
+        auth.revoke_token(token)
+        return auth.verify_token(token)
+
+    return {
+        "parse_receipt_text/short": lambda: parse_receipt_text(FAKE_RECEIPT_TEXT),
+        "parse_receipt_text/long": lambda: parse_receipt_text(LONG_RECEIPT_TEXT),
+        "parse_receipt_text/no_match": lambda: parse_receipt_text(NO_MATCH_TEXT),
+        "User.to_dict": user.to_dict,
+        "Company.to_dict": company.to_dict,
+        "UserResponse.from_orm": lambda: UserResponse.from_orm(user),
+        "CompanyResponse.from_orm": lambda: CompanyResponse.from_orm(company),
+        "create_access_token": lambda: auth.create_access_token(data={"sub": str(user.id)}),
+        "verify_token/cached": lambda: auth.verify_token(token),
+        "verify_token/uncached": verify_uncached,
+        "get_currency_for_country/known": lambda: Company.get_currency_for_country("in"),
+        "get_currency_for_country/unknown": lambda: Company.get_currency_for_country("zz"),
+    }
+
+
+def measure(func, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(func)
+    # Smallest power-of-ten-ish loop count that takes at least min_time
+    loops, elapsed = timer.autorange()
+    if elapsed < min_time:
+        loops = max(loops, int(loops * min_time / max(elapsed, 1e-9)))
+    per_call = [total / loops * 1e9 for total in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "best_ns": round(min(per_call), 1),
+        "median_ns": round(statistics.median(per_call), 1),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} µs"
+    return f"{ns:.0f} ns"
+
+
+def compare(results: dict, meta: dict, baseline_path: str, max_regression: float) -> bool:
+    """Print changes against a saved run; False if any benchmark regressed beyond the limit"""
+    baseline = json.loads(Path(baseline_path).read_text())
+    before_meta = baseline.get("meta", {})
+    for key in ("python", "machine"):
+        if before_meta.get(key) != meta[key]:
+            print(f"⚠️  Baseline {key} differs ({before_meta.get(key)} vs {meta[key]}): numbers may not be comparable")
+
+    ok = True
+    print(f"\n📊 Compared with {baseline_path} (limit {max_regression:.0%})")
+    for name, result in results.items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"➕ {name:<34} new")
+            continue
+        change = result["best_ns"] / before["best_ns"] - 1
+        regressed = change > max_regression
+        ok = ok and not regressed
+        print(f"{'❌' if regressed else '✅'} {name:<34} {format_ns(before['best_ns']):>10} -> "
+              f"{format_ns(result['best_ns']):>10}  {change:+.1%}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--filter", nargs="+", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.15)
+    args = parser.parse_args()
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = {name: func for name, func in benchmarks.items() if any(f in name for f in args.filter)}
+        if not benchmarks:
+            print(f"❌ No benchmark matches {' '.join(args.filter)}")
+            sys.exit(1)
+
+    print(f"⏱️  {len(benchmarks)} benchmarks, best of {args.repeat} x ≥{args.min_time}s")
+    results = {}
+    for name, func in benchmarks.items():
+        results[name] = measure(func, args.repeat, args.min_time)
+        print(f"   {name:<34} {format_ns(results[name]['best_ns']):>10}  "
+              f"(median {format_ns(results[name]['median_ns'])})")
+
+    meta = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({"meta": meta, "benchmarks": results}, indent=2))
+        print(f"📝 Results written to {args.json_path}")
+
+    if args.baseline and not compare(results, meta, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for Odoo Expense Management
+
+Loads N companies, M users and K expenses into a migrated database with COPY,
+for scale testing locally. The data is deterministic for a given --seed and
+--end-date and tries to look like production:
+
+- company sizes are heavy-tailed; each company has one admin, managers with a
+  span of control of about --span direct reports (managers can report to
+  managers, so hierarchies get deeper in large companies) and ~5% inactive users
+- companies are spread over a few countries and their currencies; 15% of the
+  expenses are in a foreign currency, amounts are log-normal in local terms
+- expenses are skewed towards a minority of employees, fall mostly on working
+  days over the last --months months, and recent ones are still in flight
+  while older ones are mostly approved or rejected
+- 70% carry an OCR payload (receipt text and parsed JSON) with a log-normal
+  number of lines
+
+Every seeded user has the password given by --password (hashed once).
+Companies and users are committed together; expenses are generated and loaded
+by --workers processes in chunks of 20000 rows, each committed on its own.
+
+Usage:
+    python seed_db.py --companies 100 --users 20000 --expenses 1000000 [--seed 42]
+    python seed_db.py --companies 1000 --users 200000 --expenses 10000000 --months 24
+"""
+import argparse
+import io
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import src.backend.app.utils.app  # noqa: F401  - loads the app package before its services
+from src.backend.app.services import bcrypt_worker
+from src.backend.app.services.fx_service import StubFxSource
+from src.backend.app.services.password_service import password_hasher
+from src.backend.app.utils.app.database import engine
+
+# (country, currency, weight)
+COUNTRIES = [
+    ("IN", "INR", 40), ("US", "USD", 20), ("GB", "GBP", 8), ("DE", "EUR", 7), ("FR", "EUR", 5),
+    ("AE", "AED", 5), ("SG", "SGD", 4), ("CA", "CAD", 4), ("AU", "AUD", 4), ("JP", "JPY", 3),
+]
+FOREIGN_CURRENCIES = ["USD", "EUR", "GBP", "AED", "SGD", "JPY"]
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "James", "Emma",
+    "Oliver", "Sophia", "Liam", "Mia", "Noah", "Ava", "Lucas", "Isla", "Mateo", "Chloe",
+    "Hiro", "Yuki", "Omar", "Layla", "Wei", "Mei", "Lukas", "Lena", "Hugo", "Camille",
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Mehta", "Rao", "Smith", "Johnson",
+    "Brown", "Taylor", "Wilson", "Martin", "Garcia", "Muller", "Schmidt", "Dubois", "Bernard", "Tanaka",
+    "Sato", "Khan", "Haddad", "Chen", "Wang", "Lee", "Kim", "Silva", "Rossi", "Novak",
+]
+COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Tyrell",
+    "Cyberdyne", "Wonka", "Aperture", "Massive", "Oscorp", "Nakatomi", "Pied Piper", "Dunder", "Gringotts", "Monarch",
+]
+COMPANY_SUFFIXES = ["Ltd", "Inc", "Technologies", "Solutions", "Labs", "Group", "Systems", "Consulting"]
+
+# (category, weight, typical amount in USD)
+CATEGORIES = [
+    ("Meals", 30, 25), ("Travel", 20, 180), ("Lodging", 10, 140), ("Fuel", 10, 45),
+    ("Office Supplies", 10, 30), ("Software", 8, 60), ("Client Entertainment", 7, 120), ("Training", 5, 300),
+]
+MERCHANTS = {
+    "Meals": ["Cafe Coffee Day", "Starbucks", "Domino's", "Pret A Manger", "Subway", "Haldiram's"],
+    "Travel": ["Uber", "Ola", "IndiGo", "British Airways", "Emirates", "Amtrak"],
+    "Lodging": ["Taj Hotels", "Marriott", "Hilton", "Holiday Inn", "Airbnb"],
+    "Fuel": ["Indian Oil", "Shell", "BP", "HP Petrol", "Chevron"],
+    "Office Supplies": ["Staples", "Amazon", "Flipkart", "Office Depot"],
+    "Software": ["GitHub", "Atlassian", "Zoom", "Slack", "JetBrains"],
+    "Client Entertainment": ["The Oberoi Grill", "Nobu", "Hard Rock Cafe", "Social"],
+    "Training": ["Coursera", "Udemy", "O'Reilly", "NIIT"],
+}
+RECENT_STATUSES = (["draft", "submitted", "waiting-approval", "approved", "rejected"], [35, 25, 30, 8, 2])
+SETTLED_STATUSES = (["draft", "submitted", "waiting-approval", "approved", "rejected"], [3, 2, 5, 80, 10])
+
+COMPANY_COLUMNS = (
+    "id", "name", "email", "phone", "address", "country_code", "currency_code", "is_active", "created_at", "updated_at"
+)
+USER_COLUMNS = (
+    "id", "email", "password_hash", "first_name", "last_name", "is_active", "role",
+    "created_at", "updated_at", "company_id", "manager_id",
+)
+EXPENSE_COLUMNS = (
+    "id", "company_id", "employee_id", "description", "category", "expense_date", "paid_by", "remarks",
+    "amount", "currency_code", "status", "file_url", "ocr_text", "ocr_json", "created_at", "updated_at",
+)
+
+# Expenses are generated in fixed-size chunks, each from its own seeded generator, so
+# the data for a seed does not depend on --workers or --batch-rows
+EXPENSE_CHUNK_ROWS = 20000
+
+_UUID_V4_MASK = ~((0xF << 76) | (0x3 << 62))
+_UUID_V4_BITS = (0x4 << 76) | (0x2 << 62)
+
+
+def _copy_value(value) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return str(value)
+
+
+class CopyLoader:
+    """Buffers rows and flushes them with COPY ... FROM STDIN every `batch_rows` rows"""
+
+    def __init__(self, cursor, table: str, columns, batch_rows: int, after: "CopyLoader" = None):
+        self.cursor = cursor
+        self.after = after  # loader whose rows must be in first (foreign keys)
+        self.sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        self.batch_rows = batch_rows
+        self.buffer = io.StringIO()
+        self.pending = 0
+        self.loaded = 0
+
+    def add(self, row) -> None:
+        self.buffer.write("\t".join(map(_copy_value, row)))
+        self.buffer.write("\n")
+        self.pending += 1
+        if self.pending >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        if self.after is not None:
+            self.after.flush()
+        self.buffer.seek(0)
+        self.cursor.copy_expert(self.sql, self.buffer)
+        self.loaded += self.pending
+        self.buffer = io.StringIO()
+        self.pending = 0
+
+
+def _uuid(rng: random.Random) -> str:
+    # uuid.UUID(int=..., version=4) without the object: this runs for every row
+    value = f"{rng.getrandbits(128) & _UUID_V4_MASK | _UUID_V4_BITS:032x}"
+    return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+
+def _weighted(rng: random.Random, options) -> tuple:
+    return rng.choices(options, weights=[option[-1] for option in options])[0]
+
+
+def _company_sizes(rng: random.Random, companies: int, users: int):
+    """Heavy-tailed company sizes summing to `users`, at least 1 (the admin) each"""
+    weights = [rng.paretovariate(1.2) for _ in range(companies)]
+    total = sum(weights)
+    spare = users - companies
+    sizes = [1 + int(spare * weight / total) for weight in weights]
+    for index in range(users - sum(sizes)):
+        sizes[index % companies] += 1
+    return sizes
+
+
+def seed_companies_and_users(cursor, rng, args, password_hash, start: datetime):
+    """Load companies and users; returns (user_id, company_id, currency, weight) of active users"""
+    companies = CopyLoader(cursor, "companies", COMPANY_COLUMNS, args.batch_rows)
+    users = CopyLoader(cursor, "users", USER_COLUMNS, args.batch_rows, after=companies)
+    spenders = []
+    user_number = 0
+
+    for company_number, size in enumerate(_company_sizes(rng, args.companies, args.users), start=1):
+        company_id = _uuid(rng)
+        country_code, currency_code, _ = _weighted(rng, COUNTRIES)
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {company_number}"
+        domain = f"c{company_number}-s{args.seed}.example.com"
+        created_at = start - timedelta(days=rng.randint(30, 1500))
+        companies.add((
+            company_id, name, f"admin@{domain}", f"+1-555-{rng.randint(1000000, 9999999)}",
+            f"{rng.randint(1, 999)} Market Street", country_code, currency_code, True, created_at, created_at,
+        ))
+
+        # Admin first, then managers (each reporting to the admin or an earlier manager), then employees:
+        # every manager_id refers to a row loaded before it
+        managers_needed = math.ceil((size - 1) / (args.span + 1)) if size > 1 else 0
+        managers = []
+        for position in range(size):
+            user_number += 1
+            user_id = _uuid(rng)
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            if position == 0:
+                role, manager_id, admin_id = "admin", None, user_id
+            elif position <= managers_needed:
+                role = "manager"
+                # The first `span` managers report to the admin, each later one to an earlier
+                # manager (`span` each): the hierarchy deepens with the company size
+                manager_number = len(managers)
+                manager_id = admin_id if manager_number < args.span else managers[manager_number // args.span - 1]
+                managers.append(user_id)
+            else:
+                role = "employee"
+                manager_id = rng.choice(managers) if managers else admin_id
+            is_active = position == 0 or rng.random() >= 0.05
+            joined_at = created_at + timedelta(days=rng.randint(0, max(0, (start - created_at).days)))
+            users.add((
+                user_id, f"{first_name}.{last_name}.{user_number}@{domain}".lower(), password_hash,
+                first_name, last_name, is_active, role, joined_at, joined_at, company_id, manager_id,
+            ))
+            if is_active:
+                spenders.append((user_id, company_id, currency_code, rng.paretovariate(1.5)))
+
+    companies.flush()
+    users.flush()
+    return companies.loaded, users.loaded, spenders
+
+
+def _item_lines(seed: int):
+    """Receipt item lines per category, drawn from once per receipt line"""
+    rng = random.Random(f"{seed}-receipt-items")
+    return {
+        category: [
+            f"{category} item {number}  {rng.randint(1, 4)} x {rng.uniform(1, 50):.2f}" for number in range(1, 201)
+        ]
+        for category, _, _ in CATEGORIES
+    }
+
+
+def _receipt(rng, item_lines, merchant: str, category: str, amount: float, currency: str, expense_date: str):
+    """OCR text and parsed payload shaped like the /ocr-upload output"""
+    line_count = max(3, min(200, int(rng.lognormvariate(2.3, 0.7))))
+    lines = [merchant, f"{rng.randint(1, 999)} High Street", f"Date: {expense_date}"]
+    lines += rng.choices(item_lines[category], k=line_count - 3)
+    lines.append(f"TOTAL {currency} {amount:.2f}")
+    payload = {
+        "amount": amount,
+        "currency": currency,
+        "date": expense_date,
+        "merchant": merchant,
+        "lines": lines,
+    }
+    return "\n".join(lines), json.dumps(payload)
+
+
+def _expense_chunk(state: dict, index: int) -> str:
+    """Rows of expense chunk `index` in COPY text format"""
+    rng = random.Random(f"{state['seed']}-expenses-{index}")
+    spenders, cumulative, end = state["spenders"], state["cumulative"], state["end"]
+    total_weight, last_spender = cumulative[-1], len(spenders) - 1
+    window_days = state["months"] * 30
+    category_weights = list(accumulate(weight for _, weight, _ in CATEGORIES))
+    recent_weights, settled_weights = list(accumulate(RECENT_STATUSES[1])), list(accumulate(SETTLED_STATUSES[1]))
+    rows = min(EXPENSE_CHUNK_ROWS, state["expenses"] - index * EXPENSE_CHUNK_ROWS)
+    buffer = io.StringIO()
+
+    for _ in range(rows):
+        employee_id, company_id, local_currency, _ = spenders[
+            min(bisect(cumulative, rng.random() * total_weight), last_spender)
+        ]
+        # Mostly working days, during working hours
+        created_at = end - timedelta(days=rng.random() * window_days)
+        if created_at.weekday() >= 5 and rng.random() < 0.7:
+            created_at -= timedelta(days=created_at.weekday() - 4)
+        created_at = created_at.replace(hour=8 + int(rng.random() * 12), minute=int(rng.random() * 60), microsecond=0)
+        expense_date = (created_at - timedelta(days=int(rng.expovariate(1 / 3)))).date().isoformat()
+
+        category, _, typical_usd = rng.choices(CATEGORIES, cum_weights=category_weights)[0]
+        currency = rng.choice(FOREIGN_CURRENCIES) if rng.random() < 0.15 else local_currency
+        amount = round(typical_usd * rng.lognormvariate(0, 0.6) * StubFxSource.RATES.get(currency, 1.0), 2)
+
+        age_days = (end - created_at).days
+        if age_days < 14:
+            status = rng.choices(RECENT_STATUSES[0], cum_weights=recent_weights)[0]
+        else:
+            status = rng.choices(SETTLED_STATUSES[0], cum_weights=settled_weights)[0]
+        updated_at = created_at if status == "draft" else created_at + timedelta(
+            hours=min(age_days * 24, rng.expovariate(1 / 72))
+        )
+
+        merchant = rng.choice(MERCHANTS[category])
+        file_url = ocr_text = ocr_json = None
+        if rng.random() < 0.7:
+            file_url = f"uploads/seed/{_uuid(rng)}.jpg"
+            ocr_text, ocr_json = _receipt(
+                rng, state["item_lines"], merchant, category, amount, currency, expense_date
+            )
+
+        buffer.write("\t".join(map(_copy_value, (
+            _uuid(rng), company_id, employee_id, f"{merchant} - {category}", category, expense_date,
+            "company card" if rng.random() < 0.3 else "employee", None, f"{amount:.2f}", currency, status,
+            file_url, ocr_text, ocr_json, created_at, updated_at,
+        ))))
+        buffer.write("\n")
+    return buffer.getvalue()
+
+
+# Per-process state of the expense loaders (set by _init_expense_worker)
+_expense_state: dict = {}
+
+
+def _init_expense_worker(state: dict) -> None:
+    _expense_state.update(state)
+    _expense_state["cumulative"] = list(accumulate(weight for _, _, _, weight in state["spenders"]))
+    _expense_state["item_lines"] = _item_lines(state["seed"])
+    _expense_state["connection"] = engine.raw_connection()
+
+
+def _load_expense_chunk(index: int) -> int:
+    """Generate and COPY one chunk in its own transaction; returns the row count"""
+    data = _expense_chunk(_expense_state, index)
+    connection = _expense_state["connection"]
+    try:
+        connection.cursor().copy_expert(
+            f"COPY expenses ({', '.join(EXPENSE_COLUMNS)}) FROM STDIN", io.StringIO(data)
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return data.count("\n")  # newlines inside values are escaped
+
+
+def seed_expenses(args, spenders, end: datetime) -> int:
+    """Load the expenses chunk by chunk, on --workers processes"""
+    if not spenders or args.expenses <= 0:
+        return 0
+    state = {
+        "seed": args.seed, "months": args.months, "expenses": args.expenses, "end": end, "spenders": spenders,
+    }
+    chunks = range(math.ceil(args.expenses / EXPENSE_CHUNK_ROWS))
+    loaded = 0
+    if args.workers <= 1:
+        _init_expense_worker(state)
+        results = map(_load_expense_chunk, chunks)
+    else:
+        # spawn: the parent holds an open database connection
+        pool = multiprocessing.get_context("spawn").Pool(
+            args.workers, initializer=_init_expense_worker, initargs=(state,)
+        )
+        results = pool.imap_unordered(_load_expense_chunk, chunks)
+    try:
+        for rows in results:
+            previous, loaded = loaded, loaded + rows
+            if args.progress and loaded // args.progress > previous // args.progress:
+                print(f"   ... {loaded} expenses")
+    finally:
+        if args.workers > 1:
+            pool.close()
+            pool.join()
+        else:
+            _expense_state["connection"].close()
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--users", type=int, default=10000, help="Total users across all companies")
+    parser.add_argument("--expenses", type=int, default=200000)
+    parser.add_argument("--months", type=int, default=12, help="Expenses are spread over this many months")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="Last day with expenses (default: today); part of what --seed reproduces")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--span", type=int, default=8, help="Direct reports per manager")
+    parser.add_argument("--password", default="Password123!", help="Password of every seeded user")
+    parser.add_argument("--batch-rows", type=int, default=50000, help="Rows per COPY statement (companies, users)")
+    parser.add_argument("--workers", type=int, default=max(1, min(8, (multiprocessing.cpu_count() or 2) - 1)),
+                        help="Processes generating and loading expenses")
+    parser.add_argument("--progress", type=int, default=1000000, help="Print progress every N expenses (0: never)")
+    args = parser.parse_args()
+
+    if args.companies < 1 or args.users < args.companies:
+        parser.error("need at least one company and one user (the admin) per company")
+    if args.span < 1:
+        parser.error("--span must be at least 1")
+
+    rng = random.Random(args.seed)
+    end = datetime.combine(args.end_date, datetime.max.time()).replace(microsecond=0)
+    start = end - timedelta(days=args.months * 30)
+    password_hash = bcrypt_worker.hash_password(args.password, password_hasher.rounds)
+
+    print(f"🌱 Seeding {args.companies} companies, {args.users} users, {args.expenses} expenses (seed {args.seed})")
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Monthly partitions for the whole window, so rows don't pile up in expenses_default.
+        # The function counts months ahead of the current one: an --end-date in the
+        # future needs that many; weekend expenses can move up to two days before `start`
+        today = date.today()
+        months_ahead = max(0, (args.end_date.year - today.year) * 12 + args.end_date.month - today.month)
+        cursor.execute(
+            "SELECT ensure_expense_partitions(%s, %s)",
+            ((start - timedelta(days=2)).date().replace(day=1), months_ahead),
+        )
+
+        started = time.perf_counter()
+        company_count, user_count, spenders = seed_companies_and_users(cursor, rng, args, password_hash, start)
+        elapsed = time.perf_counter() - started
+        # Committed before the expense workers, which load on their own connections
+        connection.commit()
+        print(f"✅ {company_count} companies and {user_count} users in {elapsed:.1f}s")
+
+        started = time.perf_counter()
+        expense_count = seed_expenses(args, spenders, end)
+        elapsed = time.perf_counter() - started
+        rate = expense_count / elapsed * 60 if elapsed else 0
+        print(f"✅ {expense_count} expenses in {elapsed:.1f}s ({rate:,.0f} rows/min, {args.workers} worker(s))")
+
+        cursor.execute("ANALYZE companies")
+        cursor.execute("ANALYZE users")
+        cursor.execute("ANALYZE expenses")
+        connection.commit()
+        print(f"🔑 Log in as any seeded user with password {args.password!r}, e.g. admin of company 1:")
+        cursor.execute(
+            "SELECT u.email FROM users u JOIN companies c ON c.id = u.company_id "
+            "WHERE c.email = %s AND u.role = 'admin'",
+            (f"admin@c1-s{args.seed}.example.com",),
+        )
+        row = cursor.fetchone()
+        if row:
+            print(f"   {row[0]}")
+    except Exception as e:
+        connection.rollback()
+        print(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
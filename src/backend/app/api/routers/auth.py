@@ -1,35 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from src.backend.app.utils.app.database import get_db
+from typing import Optional
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.utils.app.database import AsyncDbSession
+from src.backend.app.utils.app.read_replicas import get_async_write_db
 from src.backend.app.models.user import User
 from src.backend.app.models.company import Company
 from src.backend.app.schemas.auth_schemas import (
     SignupRequest, LoginRequest, AuthResponse, 
     UserResponse, CompanyResponse, TokenResponse
 )
-from src.backend.app.utils.app.utils.auth import create_access_token, create_refresh_token, verify_token, get_current_user
+from src.backend.app.utils.app.utils.auth import (
+    create_access_token, create_refresh_token, decode_refresh_token, get_current_user_async, optional_security,
+    revoke_access_token
+)
+from src.backend.app.utils.app.utils.user_cache import invalidate_user
+from src.backend.app.services.token_revocation import revocation_store
+from src.backend.app.utils.app.utils.rate_limit import enforce_rate_limit
+from src.backend.app.utils.app.config import settings
 
 router = APIRouter()
 
+# Endpoints run on get_async_db (AsyncSession in async mode) and await bcrypt on
+# the password hashing pool, so neither holds a threadpool thread.
+
 @router.post("/signup", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
+async def signup(signup_data: SignupRequest, request: Request, db: AsyncDbSession = Depends(get_async_write_db)):
     """
     First-time signup that creates both company and admin user
     """
+    # Before any query or password hashing
+    await run_in_threadpool(
+        enforce_rate_limit, request, "signup",
+        per_ip=(settings.signup_rate_per_ip_per_minute, settings.signup_burst_per_ip)
+    )
+    
     # Check if user already exists
-    if db.query(User).filter(User.email == signup_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == signup_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
     
     # Check if company email already exists
-    if db.query(Company).filter(Company.email == signup_data.company_email).first():
+    if await db.scalar(select(Company.id).where(Company.email == signup_data.company_email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Company with this email already exists"
         )
     
+    # Hashed before the transaction starts, so no connection is held meanwhile
+    password_hash = await User.hash_password_async(signup_data.password)
+    
     try:
         # Create company first
         company = Company(
@@ -41,12 +66,13 @@ def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
         )
         
         db.add(company)
-        db.flush()  # Get the company ID
+        await db.flush()  # Get the company ID
         
         # Create admin user
         admin_user = User(
             email=signup_data.email,
-            password=signup_data.password,
+            password=None,
+            password_hash=password_hash,
             first_name=signup_data.first_name,
             last_name=signup_data.last_name,
             company_id=company.id,
@@ -54,9 +80,9 @@ def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
         )
         
         db.add(admin_user)
-        db.commit()
-        db.refresh(admin_user)
-        db.refresh(company)
+        await db.commit()
+        await db.refresh(admin_user)
+        await db.refresh(company)
         
         # Generate tokens
         access_token = create_access_token(data={"sub": str(admin_user.id)})
@@ -71,21 +97,31 @@ def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 @router.post("/login", response_model=AuthResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db: AsyncDbSession = Depends(get_async_write_db)):
     """
     User login
     """
-    # Find user
-    user = db.query(User).filter(User.email == login_data.email).first()
+    # Before any query or password hashing
+    await run_in_threadpool(
+        enforce_rate_limit, request, "login",
+        per_ip=(settings.login_rate_per_ip_per_minute, settings.login_burst_per_ip),
+        account=login_data.email,
+        per_account=(settings.login_rate_per_account_per_minute, settings.login_burst_per_account)
+    )
+    
+    # Find user (company is part of the response: load it in the same query)
+    user = await db.scalar(
+        select(User).options(joinedload(User.company)).where(User.email == login_data.email)
+    )
     
-    if not user or not user.check_password(login_data.password):
+    if not user or not await user.check_password_async(login_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -97,26 +133,43 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="Account is deactivated"
         )
     
+    # Built before the rehash below changes the user
+    user_response = UserResponse.from_orm(user)
+    company_response = CompanyResponse.from_orm(user.company)
+    
+    # Upgrade hashes made with old bcrypt parameters while we have the plaintext
+    if user.password_needs_rehash():
+        try:
+            await user.set_password_async(login_data.password)
+            await db.commit()
+            invalidate_user(user.id)
+        except Exception as e:
+            await db.rollback()
+            print(f"Error rehashing password: {e}")
+    
     # Generate tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user_response.id)})
+    refresh_token = create_refresh_token(data={"sub": str(user_response.id)})
     
     return AuthResponse(
         message="Login successful",
-        user=UserResponse.from_orm(user),
-        company=CompanyResponse.from_orm(user.company),
+        user=user_response,
+        company=company_response,
         access_token=access_token,
         refresh_token=refresh_token
     )
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str, db: AsyncDbSession = Depends(get_async_write_db)):
     """
     Refresh access token
+    
+    The refresh token is rotated: the one presented is consumed and a new one
+    is returned, so each refresh token can be used only once.
     """
     try:
-        user_id = verify_token(refresh_token, "refresh")
-        user = db.query(User).filter(User.id == user_id).first()
+        user_id, jti, expires_at = decode_refresh_token(refresh_token)
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(user_id)))
         
         if not user or not user.is_active:
             raise HTTPException(
@@ -124,23 +177,61 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
                 detail="User not found or inactive"
             )
         
+        if not await db.run_sync(revocation_store.consume, jti, user.id, expires_at):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        await db.commit()
+        
         access_token = create_access_token(data={"sub": str(user.id)})
+        new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
         
         return TokenResponse(
             access_token=access_token,
-            refresh_token=refresh_token
+            refresh_token=new_refresh_token
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
         )
+
+@router.post("/logout")
+async def logout(
+    refresh_token: str,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncDbSession = Depends(get_async_write_db)
+):
+    """
+    Revoke a refresh token, and the access token sent as bearer (if any)
+    """
+    user_id, jti, expires_at = decode_refresh_token(refresh_token)
+    
+    try:
+        await db.run_sync(revocation_store.revoke, jti, uuid.UUID(user_id), expires_at)
+        if credentials is not None:
+            await db.run_sync(revoke_access_token, credentials.credentials)
+        await db.commit()
+        
+        return {"message": "Logged out successfully"}
         
     except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 @router.get("/me")
-def get_current_user_info(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_current_user_info(
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Get current user information
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from src.backend.app.utils.app.database import get_db
+from src.backend.app.utils.app.database import AsyncDbSession
+from src.backend.app.utils.app.read_replicas import get_async_read_db
 from src.backend.app.models.user import User
 from src.backend.app.schemas.auth_schemas import CompanyResponse, CompanyStatsResponse
-from src.backend.app.utils.app.utils.auth import get_current_user, get_current_admin_user
+from src.backend.app.utils.app.utils.auth import get_current_user_async, get_current_admin_user_async
+from src.backend.app.services.company_stats import get_user_counts_async
 
 router = APIRouter()
 
 @router.get("/me", response_model=CompanyResponse)
-def get_my_company(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_my_company(
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Get current user's company information
@@ -18,47 +18,26 @@ def get_my_company(
     return CompanyResponse.from_orm(current_user.company)
 
 @router.get("/stats", response_model=CompanyStatsResponse)
-def get_company_stats(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+async def get_company_stats(
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncDbSession = Depends(get_async_read_db)
 ):
     """
     Get company statistics (admin only)
     """
     company = current_user.company
     
-    # Get user statistics
-    total_users = db.query(User).filter(
-        User.company_id == company.id,
-        User.is_active == True
-    ).count()
-    
-    admin_count = db.query(User).filter(
-        User.company_id == company.id,
-        User.role == 'admin',
-        User.is_active == True
-    ).count()
-    
-    manager_count = db.query(User).filter(
-        User.company_id == company.id,
-        User.role == 'manager',
-        User.is_active == True
-    ).count()
-    
-    employee_count = db.query(User).filter(
-        User.company_id == company.id,
-        User.role == 'employee',
-        User.is_active == True
-    ).count()
+    # One grouped query on a cache miss, none on a hit
+    counts = await get_user_counts_async(db, company.id)
     
     return CompanyStatsResponse(
         company_id=str(company.id),
         company_name=company.name,
-        total_users=total_users,
+        total_users=sum(counts.values()),
         user_breakdown={
-            'admins': admin_count,
-            'managers': manager_count,
-            'employees': employee_count
+            'admins': counts['admin'],
+            'managers': counts['manager'],
+            'employees': counts['employee']
         },
         currency=company.currency_code,
         country=company.country_name
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List, Dict, Optional
+from datetime import date
 from src.backend.app.services.country_service import country_service
+from src.backend.app.services.fx_service import fx_rate_store, fx_rate_fetcher
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -16,6 +18,16 @@ class ExchangeRatesResponse(BaseModel):
     date: Optional[str] = None
     rates: Dict[str, float]
 
+class ConvertBatchRequest(BaseModel):
+    amounts: List[float]
+    source_currencies: List[str]
+    target_currency: str
+    dates: Optional[List[date]] = None  # per-row rate date, latest rates when omitted
+
+class ConvertBatchResponse(BaseModel):
+    target_currency: str
+    amounts: List[float]
+
 @router.get("/countries", response_model=List[CountryResponse])
 async def get_countries():
     """
@@ -30,10 +42,24 @@ async def get_countries():
             detail=f"Failed to fetch countries: {str(e)}"
         )
 
+async def _ensure_fx_rates():
+    if fx_rate_store.is_empty():
+        # Cold start before the scheduled fetcher has produced a snapshot; after a
+        # failed fetch, requests get a 503 at once until the retry window has passed
+        try:
+            await fx_rate_fetcher.refresh(retry_backoff=True)
+        except Exception as e:
+            if fx_rate_store.is_empty():
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Exchange rate service unavailable: {str(e)}"
+                )
+
 @router.get("/exchange-rates/{base_currency}", response_model=ExchangeRatesResponse)
-async def get_exchange_rates(base_currency: str):
+async def get_exchange_rates(base_currency: str, on: Optional[date] = None):
     """
-    Get current exchange rates for a specific base currency
+    Get exchange rates for a specific base currency from the local FX store
+    (latest snapshot, or the latest one on or before `on`)
     """
     # Validate currency code (basic validation)
     if not base_currency or len(base_currency) != 3:
@@ -41,30 +67,40 @@ async def get_exchange_rates(base_currency: str):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Currency code must be a 3-letter ISO code (e.g., USD, EUR)"
         )
+    base_currency = base_currency.upper()
+    await _ensure_fx_rates()
     
+    result = fx_rate_store.rates_for(base_currency, on)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No exchange rates for {base_currency}" + (f" on or before {on}" if on else "")
+        )
+    
+    rate_date, rates = result
+    return ExchangeRatesResponse(base=base_currency, date=rate_date.isoformat(), rates=rates)
+
+@router.post("/convert", response_model=ConvertBatchResponse)
+async def convert_batch(request: ConvertBatchRequest):
+    """
+    Convert many amounts into one target currency using the local FX store
+    """
+    target_currency = request.target_currency.upper()
+    await _ensure_fx_rates()
     try:
-        rates = await country_service.get_exchange_rates(base_currency.upper())
-        
-        # Check if there was an error fetching rates
-        if "error" in rates:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Exchange rate service unavailable: {rates['error']}"
-            )
-        
-        return ExchangeRatesResponse(
-            base=rates.get("base", base_currency.upper()),
-            date=rates.get("date"),
-            rates=rates.get("rates", {})
+        converted = fx_rate_store.convert_batch(
+            request.amounts,
+            [code.upper() for code in request.source_currencies],
+            target_currency,
+            request.dates,
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch exchange rates: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
+    
+    return ConvertBatchResponse(target_currency=target_currency, amounts=converted.tolist())
 
 @router.get("/exchange-rates")
 async def get_default_exchange_rates():
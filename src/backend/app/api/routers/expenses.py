@@ -1,11 +1,14 @@
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ...utils.app.database import get_db
+from starlette.concurrency import run_in_threadpool
+from ...utils.app.database import AsyncDbSession
+from ...utils.app.read_replicas import get_async_read_db, get_async_write_db
 from ...services.ocr_service import _extract_text, parse_receipt_text
 from ...models.expense import Expense
+from ...services.archive_service import get_expense
+from ...utils.app.utils.metrics import OCR_DURATION, OCR_JOBS_IN_FLIGHT
 from sqlalchemy import select
-import uuid, os, shutil
-from datetime import date
+import uuid, os
+from datetime import date, timedelta
 
 router = APIRouter()
 
@@ -51,7 +54,7 @@ async def ocr_upload_receipt(
     file: UploadFile = File(...),
     employee_id: str | None = Form(None),
     company_id: str | None = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncDbSession = Depends(get_async_write_db),
 ):
     # if IDs are missing or invalid -> create/fetch demo ones
     try:
@@ -61,19 +64,27 @@ async def ocr_upload_receipt(
         emp_id = comp_id = None
 
     if not emp_id or not comp_id:
-        comp_id, emp_id = _ensure_demo_entities(db)
+        comp_id, emp_id = await db.run_sync(_ensure_demo_entities)
 
     # 1) persist file
     ext = os.path.splitext(file.filename or "")[1] or ".jpg"
     out_name = f"{uuid.uuid4()}{ext}"
     out_path = os.path.join(UPLOAD_DIR, out_name)
-    with open(out_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    img_bytes = await file.read()
 
-    # 2) OCR + parse
-    with open(out_path, "rb") as fh:
-        img_bytes = fh.read()
-    text = _extract_text(img_bytes) or ""
+    def _save_upload():
+        with open(out_path, "wb") as f:
+            f.write(img_bytes)
+
+    await run_in_threadpool(_save_upload)
+
+    # 2) OCR + parse (CPU-bound: keep it off the event loop)
+    def _timed_extract_text():
+        with OCR_DURATION.time():
+            return _extract_text(img_bytes)
+
+    with OCR_JOBS_IN_FLIGHT.track_inprogress():
+        text = await run_in_threadpool(_timed_extract_text) or ""
     parsed = parse_receipt_text(text)
 
     # 3) insert expense (draft)
@@ -108,8 +119,8 @@ async def ocr_upload_receipt(
         },
     )
     db.add(exp)
-    db.commit()
-    db.refresh(exp)
+    await db.commit()
+    await db.refresh(exp)
 
     return {
         "expense": {
@@ -129,33 +140,55 @@ async def ocr_upload_receipt(
 
 
 @router.get("/by-employee/{employee_id}")
-def list_by_employee(employee_id: str, db: Session = Depends(get_db)):
-    q = select(Expense).where(Expense.employee_id == uuid.UUID(employee_id)).order_by(Expense.created_at.desc())
-    rows = db.execute(q).scalars().all()
-    return [
-        {
-            "id": str(r.id),
-            "employee_id": str(r.employee_id),
-            "description": r.description,
-            "date": str(r.expense_date) if r.expense_date else "",
-            "category": r.category or "",
-            "paidBy": r.paid_by or "",
-            "remarks": r.remarks or "",
-            "amount": float(r.amount or 0),
-            "currency": r.currency_code,
-            "status": r.status,
-            "file_url": r.file_url,
-        }
-        for r in rows
-    ]
+async def list_by_employee(
+    employee_id: str,
+    created_from: date | None = None,
+    created_to: date | None = None,
+    db: AsyncDbSession = Depends(get_async_read_db),
+):
+    q = select(Expense).where(Expense.employee_id == uuid.UUID(employee_id))
+    # expenses is range-partitioned on created_at: bounding it lets Postgres prune partitions
+    if created_from:
+        q = q.where(Expense.created_at >= created_from)
+    if created_to:
+        q = q.where(Expense.created_at < created_to + timedelta(days=1))
+    q = q.order_by(Expense.created_at.desc())
+    rows = (await db.execute(q)).scalars().all()
+    return [_expense_row(r) for r in rows]
+
+
+def _expense_row(r) -> dict:
+    return {
+        "id": str(r.id),
+        "employee_id": str(r.employee_id),
+        "description": r.description,
+        "date": str(r.expense_date) if r.expense_date else "",
+        "category": r.category or "",
+        "paidBy": r.paid_by or "",
+        "remarks": r.remarks or "",
+        "amount": float(r.amount or 0),
+        "currency": r.currency_code,
+        "status": r.status,
+        "file_url": r.file_url,
+    }
 
 from fastapi import HTTPException
 
+@router.get("/{expense_id}")
+async def get_expense_by_id(expense_id: str, db: AsyncDbSession = Depends(get_async_read_db)):
+    # Falls back to expenses_archive for closed expenses past retention
+    exp = await db.run_sync(get_expense, uuid.UUID(expense_id))
+    if not exp:
+        raise HTTPException(status_code=404, detail="Expense not found")
+    return {**_expense_row(exp), "archived": not isinstance(exp, Expense)}
+
 @router.put("/{expense_id}")
-def update_expense(expense_id: str, payload: dict, db: Session = Depends(get_db)):
-    exp = db.get(Expense, uuid.UUID(expense_id))
+async def update_expense(expense_id: str, payload: dict, db: AsyncDbSession = Depends(get_async_write_db)):
+    exp = await db.run_sync(get_expense, uuid.UUID(expense_id))
     if not exp:
         raise HTTPException(status_code=404, detail="Expense not found")
+    if not isinstance(exp, Expense):
+        raise HTTPException(status_code=409, detail="Archived expenses are read-only")
     for k in ["description", "category", "paid_by", "remarks", "currency_code", "status"]:
         if k in payload and payload[k] is not None:
             setattr(exp, k, payload[k])
@@ -168,5 +201,5 @@ def update_expense(expense_id: str, payload: dict, db: Session = Depends(get_db)
             exp.expense_date = date(y, m, d)
         except Exception:
             pass
-    db.commit()
+    await db.commit()
     return {"ok": True, "id": str(exp.id)}
@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import pool_stats
+from src.backend.app.utils.app.read_replicas import replica_router
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    if settings.internal_api_token and x_internal_token != settings.internal_api_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    """
+    Connection pool statistics of this worker process
+    
+    checked_out is the number of connections in use; waiting the callers
+    queued for one. Checkout times include pre-ping and new connections.
+    """
+    return pool_stats()
+
+@router.get("/replicas")
+def get_replica_stats():
+    """
+    Read replica lag/health and how many reads went to replicas vs the primary
+    """
+    return replica_router.stats()
@@ -1,54 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import json
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from src.backend.app.utils.app.database import get_db
+from typing import Dict, List, Optional
+from src.backend.app.utils.app.database import AsyncDbSession
+from src.backend.app.utils.app.read_replicas import get_async_read_db, get_async_write_db, get_write_db
 from src.backend.app.models.user import User
 from src.backend.app.schemas.auth_schemas import (
     CreateUserRequest, UpdateUserRequest, ChangePasswordRequest,
-    UserResponse, UsersListResponse
+    UserResponse, UsersListResponse, BulkCreateUsersRequest, BulkCreateUsersResponse
 )
-from src.backend.app.utils.app.utils.auth import get_current_user, get_current_admin_user, get_current_manager_user
+from src.backend.app.utils.app.utils.auth import (
+    get_current_admin_user, get_current_admin_user_async, get_current_manager_user_async, get_current_user_async
+)
+from src.backend.app.utils.app.utils.user_cache import invalidate_user
+from src.backend.app.services.user_provisioning import parse_csv, provision_users
+from src.backend.app.services.company_stats import record_user_change
+from src.backend.app.services.user_directory import SEARCH_MODES, InvalidCursor, list_users
+from src.backend.app.utils.app.config import settings
 
 router = APIRouter()
 
+# Endpoints run on get_async_db (AsyncSession in async mode), except bulk
+# provisioning, which streams from a sync session; bcrypt is awaited on the
+# password hashing pool.
+
+def _user_uuid(user_id: str) -> Optional[uuid.UUID]:
+    """None for a malformed id, which then matches no user"""
+    try:
+        return uuid.UUID(user_id)
+    except ValueError:
+        return None
+
 @router.get("/", response_model=UsersListResponse)
-def get_users(
-    current_user: User = Depends(get_current_manager_user),
-    db: Session = Depends(get_db)
+async def get_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    role: Optional[str] = None,
+    manager_id: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    q: Optional[str] = Query(None, max_length=100),
+    search: str = "prefix",
+    current_user: User = Depends(get_current_manager_user_async),
+    db: AsyncDbSession = Depends(get_async_read_db)
 ):
     """
-    Get all users in the company (admin and managers only)
+    List users in the company, one page at a time (admin and managers only)
+    
+    Admins see the whole company, managers their subordinates. Pass the returned
+    next_cursor to get the following page. q searches name and email, either by
+    prefix (search=prefix) or by similarity (search=fuzzy). total is an estimate
+    when total_is_estimate is true.
     """
-    # Get users based on role
-    if current_user.is_admin():
-        # Admin can see all users in the company
-        users = db.query(User).filter(
-            User.company_id == current_user.company_id,
-            User.is_active == True
-        ).all()
-    else:
+    if search not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"search must be one of: {', '.join(SEARCH_MODES)}"
+        )
+    
+    if not current_user.is_admin():
         # Manager can see their subordinates
-        users = db.query(User).filter(
-            User.manager_id == current_user.id,
-            User.is_active == True
-        ).all()
+        manager_id = str(current_user.id)
+    
+    try:
+        manager_uuid = uuid.UUID(manager_id) if manager_id else None
+        users, next_cursor, total, total_is_estimate = await db.run_sync(
+            list_users,
+            current_user.company_id,
+            limit=limit,
+            cursor=cursor,
+            role=role,
+            manager_id=manager_uuid,
+            is_active=is_active,
+            q=q,
+            search=search
+        )
+    except (InvalidCursor, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return UsersListResponse(
         users=[UserResponse.from_orm(user) for user in users],
-        total=len(users)
+        total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor
     )
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: CreateUserRequest,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncDbSession = Depends(get_async_write_db)
 ):
     """
     Create a new user (admin only)
     """
     # Check if user already exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
@@ -57,22 +110,26 @@ def create_user(
     # Validate manager if provided
     manager_id = user_data.manager_id
     if manager_id:
-        manager = db.query(User).filter(
+        manager_id = _user_uuid(manager_id)
+        manager = await db.scalar(select(User).where(
             User.id == manager_id,
             User.company_id == current_user.company_id,
             User.is_active == True
-        ).first()
+        ))
         if not manager or not manager.is_manager():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid manager specified"
             )
     
+    password_hash = await User.hash_password_async(user_data.password)
+    
     try:
         # Create new user
         new_user = User(
             email=user_data.email,
-            password=user_data.password,
+            password=None,
+            password_hash=password_hash,
             first_name=user_data.first_name,
             last_name=user_data.last_name,
             company_id=current_user.company_id,
@@ -81,24 +138,90 @@ def create_user(
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        record_user_change(new_user.company_id, None, (new_user.role, True))
         
         return UserResponse.from_orm(new_user)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
+def _run_bulk_provisioning(db: Session, company_id, rows: List[Dict], progress: bool):
+    if len(rows) > settings.user_bulk_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.user_bulk_max_rows} users per request"
+        )
+    
+    events = provision_users(db, company_id, rows)
+    if progress:
+        # NDJSON: progress lines while validating, hashing and inserting, then the
+        # result (or error) line
+        return StreamingResponse(
+            (json.dumps(event) + "\n" for event in events),
+            status_code=status.HTTP_201_CREATED,
+            media_type="application/x-ndjson"
+        )
+    
+    for event in events:
+        if event["type"] == "error":
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=event["detail"]
+            )
+    event.pop("type")
+    return BulkCreateUsersResponse(**event)
+
+@router.post("/bulk", response_model=BulkCreateUsersResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_users(
+    bulk_data: BulkCreateUsersRequest,
+    progress: bool = False,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Create many users at once (admin only)
+    
+    Valid rows are created, invalid ones are reported per row. Managers may be
+    given by manager_id or by manager_email, including managers created in the
+    same request. With progress=true the response is streamed as NDJSON.
+    """
+    rows = [row.model_dump() for row in bulk_data.users]
+    return _run_bulk_provisioning(db, current_user.company_id, rows, progress)
+
+@router.post("/bulk/csv", response_model=BulkCreateUsersResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_users_csv(
+    file: UploadFile = File(...),
+    progress: bool = False,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_write_db)
+):
+    """
+    Create many users from a CSV upload (admin only)
+    
+    Header: email,password,first_name,last_name,role,manager_id,manager_email
+    (role, manager_id and manager_email may be left empty).
+    """
+    try:
+        rows = parse_csv(file.file.read())
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV file: {str(e)}"
+        )
+    return _run_bulk_provisioning(db, current_user.company_id, rows, progress)
+
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: str,
     user_data: UpdateUserRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncDbSession = Depends(get_async_write_db)
 ):
     """
     Update user information (admin and managers for their subordinates)
@@ -111,10 +234,10 @@ def update_user(
         )
     
     # Get target user
-    target_user = db.query(User).filter(
-        User.id == user_id,
+    target_user = await db.scalar(select(User).where(
+        User.id == _user_uuid(user_id),
         User.company_id == current_user.company_id
-    ).first()
+    ))
     
     if not target_user:
         raise HTTPException(
@@ -122,6 +245,8 @@ def update_user(
             detail="User not found"
         )
     
+    before = (target_user.role, target_user.is_active)
+    
     try:
         # Update user fields
         if user_data.first_name is not None:
@@ -139,44 +264,47 @@ def update_user(
         if user_data.manager_id is not None and current_user.is_admin():
             manager_id = user_data.manager_id
             if manager_id:
-                manager = db.query(User).filter(
+                manager_id = _user_uuid(manager_id)
+                manager = await db.scalar(select(User).where(
                     User.id == manager_id,
                     User.company_id == current_user.company_id,
                     User.is_active == True
-                ).first()
+                ))
                 if not manager or not manager.is_manager():
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Invalid manager specified"
                     )
-            target_user.manager_id = manager_id
+            target_user.manager_id = manager_id or None
         
-        db.commit()
-        db.refresh(target_user)
+        await db.commit()
+        invalidate_user(target_user.id)
+        record_user_change(target_user.company_id, before, (target_user.role, target_user.is_active))
+        await db.refresh(target_user)
         
         return UserResponse.from_orm(target_user)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 @router.delete("/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: str,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncDbSession = Depends(get_async_write_db)
 ):
     """
     Deactivate user (admin only)
     """
     # Get target user
-    target_user = db.query(User).filter(
-        User.id == user_id,
+    target_user = await db.scalar(select(User).where(
+        User.id == _user_uuid(user_id),
         User.company_id == current_user.company_id
-    ).first()
+    ))
     
     if not target_user:
         raise HTTPException(
@@ -192,61 +320,67 @@ def delete_user(
     
     try:
         # Deactivate user
+        before = (target_user.role, target_user.is_active)
         target_user.is_active = False
-        db.commit()
+        await db.commit()
+        invalidate_user(target_user.id)
+        record_user_change(target_user.company_id, before, (target_user.role, False))
         
         return {"message": "User deactivated successfully"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 @router.put("/change-password")
-def change_password(
+async def change_password(
     password_data: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncDbSession = Depends(get_async_write_db)
 ):
     """
     Change user password
     """
     # Verify current password
-    if not current_user.check_password(password_data.current_password):
+    if not await current_user.check_password_async(password_data.current_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
+    user_id = current_user.id
+    await current_user.set_password_async(password_data.new_password)
+    
     try:
-        # Update password
-        current_user.set_password(password_data.new_password)
-        db.commit()
+        # Update password (current_user belongs to this session)
+        await db.commit()
+        invalidate_user(user_id)
         
         return {"message": "Password changed successfully"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 @router.get("/managers", response_model=List[UserResponse])
-def get_managers(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+async def get_managers(
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncDbSession = Depends(get_async_read_db)
 ):
     """
     Get all managers and admins in the company (for assignment purposes)
     """
     # Get all managers and admins
-    managers = db.query(User).filter(
+    managers = (await db.execute(select(User).where(
         User.company_id == current_user.company_id,
         User.role.in_(['admin', 'manager']),
         User.is_active == True
-    ).all()
+    ))).scalars().all()
     
     return [UserResponse.from_orm(manager) for manager in managers]
\ No newline at end of file
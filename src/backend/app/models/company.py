@@ -3,8 +3,8 @@ from sqlalchemy import Column, String, Boolean, DateTime, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
-import pycountry
 from src.backend.app.utils.app.database import Base
+from src.backend.app.services.country_registry import country_registry
 
 class Company(Base):
     __tablename__ = 'companies'
@@ -34,28 +34,11 @@ class Company(Base):
     @staticmethod
     def get_currency_for_country(country_code):
         """Get the currency code for a given country code"""
-        country_currency_map = {
-            'US': 'USD', 'IN': 'INR', 'GB': 'GBP', 'DE': 'EUR', 'FR': 'EUR',
-            'IT': 'EUR', 'ES': 'EUR', 'CA': 'CAD', 'AU': 'AUD', 'JP': 'JPY',
-            'CN': 'CNY', 'BR': 'BRL', 'MX': 'MXN', 'RU': 'RUB', 'KR': 'KRW',
-            'SG': 'SGD', 'HK': 'HKD', 'CH': 'CHF', 'SE': 'SEK', 'NO': 'NOK',
-            'DK': 'DKK', 'NZ': 'NZD', 'ZA': 'ZAR', 'TH': 'THB', 'MY': 'MYR',
-            'ID': 'IDR', 'PH': 'PHP', 'VN': 'VND', 'AE': 'AED', 'SA': 'SAR',
-            'TR': 'TRY', 'PL': 'PLN', 'CZ': 'CZK', 'HU': 'HUF', 'RO': 'RON',
-            'HR': 'HRK', 'BG': 'BGN', 'LT': 'EUR', 'LV': 'EUR', 'EE': 'EUR',
-            'SI': 'EUR', 'SK': 'EUR', 'MT': 'EUR', 'CY': 'EUR', 'LU': 'EUR',
-            'BE': 'EUR', 'NL': 'EUR', 'AT': 'EUR', 'FI': 'EUR', 'PT': 'EUR',
-            'IE': 'EUR', 'GR': 'EUR'
-        }
-        return country_currency_map.get(country_code.upper(), 'USD')
+        return country_registry.currency_for_country(country_code.upper()) or 'USD'
     
     @property
     def country_name(self):
-        try:
-            country = pycountry.countries.get(alpha_2=self.country_code)
-            return country.name if country else self.country_code
-        except Exception:
-            return self.country_code
+        return country_registry.country_name(self.country_code) or self.country_code
     
     def to_dict(self):
         return {
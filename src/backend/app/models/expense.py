@@ -5,8 +5,8 @@ from datetime import datetime
 import uuid
 from ..utils.app.database import Base
 
-class Expense(Base):
-    __tablename__ = "expenses"
+class ExpenseFields:
+    """Columns shared by the hot `expenses` table and `expenses_archive`"""
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     company_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
@@ -29,3 +29,12 @@ class Expense(Base):
 
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+class Expense(ExpenseFields, Base):
+    __tablename__ = "expenses"
+
+class ExpenseArchive(ExpenseFields, Base):
+    """Closed expenses moved out of the hot table (read-only)"""
+    __tablename__ = "expenses_archive"
+
+    archived_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Date, Numeric
+from datetime import date, datetime
+from ..utils.app.database import Base
+
+class FxRate(Base):
+    """Units of `currency_code` per one unit of `pivot_currency` on `rate_date`"""
+    __tablename__ = "fx_rates"
+
+    pivot_currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    rate_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency_code: Mapped[str] = mapped_column(String(3), primary_key=True)
+
+    rate: Mapped[float] = mapped_column(Numeric(24, 10))
+    fetched_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -0,0 +1,16 @@
+import uuid
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from ..utils.app.database import Base
+
+class RevokedToken(Base):
+    """Refresh token (by jti) revoked or already exchanged, or access token (by digest) revoked at logout"""
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    expires_at: Mapped[datetime]
+    revoked_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -2,11 +2,9 @@ from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
 import uuid
 from src.backend.app.utils.app.database import Base
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.backend.app.services.password_service import password_hasher
 
 class User(Base):
     __tablename__ = 'users'
@@ -29,23 +27,47 @@ class User(Base):
     company = relationship('Company', back_populates='users')
     manager = relationship('User', remote_side=[id], backref='subordinates')
     
-    def __init__(self, email, password, first_name, last_name, company_id, role='employee', manager_id=None):
+    def __init__(self, email, password, first_name, last_name, company_id, role='employee', manager_id=None,
+                 password_hash=None):
         self.email = email
-        self.set_password(password)
+        if password_hash is not None:
+            # Hashed by the caller (hash_password_async), e.g. from an async endpoint
+            self.password_hash = password_hash
+        else:
+            self.set_password(password)
         self.first_name = first_name
         self.last_name = last_name
         self.company_id = company_id
         self.role = role
         self.manager_id = manager_id
     
-    def set_password(self, password):
+    @staticmethod
+    def prepare_password(password):
         # Bcrypt has a 72 byte limit, so truncate if necessary
         if len(password.encode('utf-8')) > 72:
             password = password[:72]
-        self.password_hash = pwd_context.hash(password)
+        return password
+    
+    def set_password(self, password):
+        self.password_hash = password_hasher.hash(self.prepare_password(password))
     
     def check_password(self, password):
-        return pwd_context.verify(password, self.password_hash)
+        return password_hasher.verify(password, self.password_hash)
+    
+    @classmethod
+    async def hash_password_async(cls, password):
+        """Hash without holding a threadpool thread (for async endpoints)"""
+        return await password_hasher.hash_async(cls.prepare_password(password))
+    
+    async def set_password_async(self, password):
+        self.password_hash = await self.hash_password_async(password)
+    
+    async def check_password_async(self, password):
+        return await password_hasher.verify_async(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        """True if the stored hash uses outdated bcrypt parameters"""
+        return password_hasher.needs_rehash(self.password_hash)
     
     def is_admin(self):
         return self.role == 'admin'
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 from datetime import datetime
-import pycountry
+from src.backend.app.services.country_registry import country_registry
 
 class SignupRequest(BaseModel):
     email: EmailStr
@@ -34,11 +34,9 @@ class SignupRequest(BaseModel):
     
     @validator('country_code')
     def validate_country_code(cls, v):
-        try:
-            pycountry.countries.get(alpha_2=v.upper())
-            return v.upper()
-        except Exception:
+        if not country_registry.is_country(v.upper()):
             raise ValueError('Invalid country code')
+        return v.upper()
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -70,6 +68,31 @@ class CreateUserRequest(BaseModel):
             raise ValueError('Role must be either employee or manager')
         return v
 
+class BulkUserRow(BaseModel):
+    """One row of a bulk import; validated per row so bad rows are reported, not fatal"""
+    email: str
+    password: str
+    first_name: str
+    last_name: str
+    role: str = 'employee'
+    manager_id: Optional[str] = None
+    manager_email: Optional[str] = None
+
+class BulkCreateUsersRequest(BaseModel):
+    users: list[BulkUserRow]
+
+class BulkRowError(BaseModel):
+    row: int
+    email: Optional[str]
+    error: str
+
+class BulkCreateUsersResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    errors: list[BulkRowError]
+    user_ids: list[str]
+
 class UpdateUserRequest(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -179,6 +202,8 @@ class AuthResponse(BaseModel):
 class UsersListResponse(BaseModel):
     users: list[UserResponse]
     total: int
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
 
 class CompanyStatsResponse(BaseModel):
     company_id: str
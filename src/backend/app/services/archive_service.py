@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Union
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from src.backend.app.models.expense import Expense, ExpenseArchive
+from src.backend.app.utils.app.config import settings
+
+# Expenses in these statuses are never edited again and may be archived
+CLOSED_STATUSES = ("approved", "rejected")
+
+_ARCHIVE_COLUMNS = (
+    "id, company_id, employee_id, description, category, expense_date, paid_by, remarks, "
+    "amount, currency_code, status, file_url, ocr_text, ocr_json, created_at, updated_at"
+)
+
+# Moves one batch in a single statement: the rows are locked (skipping any a
+# concurrent job already holds), deleted from the hot table and inserted into
+# the archive together with their OCR payloads.
+_ARCHIVE_BATCH_SQL = text(f"""
+    WITH batch AS (
+        SELECT id, created_at FROM expenses
+        WHERE status IN :statuses AND updated_at < :cutoff
+        ORDER BY created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ), moved AS (
+        DELETE FROM expenses e
+        USING batch b
+        WHERE e.id = b.id AND e.created_at = b.created_at
+        RETURNING e.*
+    )
+    INSERT INTO expenses_archive ({_ARCHIVE_COLUMNS})
+    SELECT {_ARCHIVE_COLUMNS} FROM moved
+""").bindparams(bindparam("statuses", value=list(CLOSED_STATUSES), expanding=True))
+
+
+def archive_closed_expenses(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Move closed expenses last updated more than `retention_days` ago into
+    `expenses_archive`, committing after every batch.
+    Returns: Number of expenses archived
+    """
+    if retention_days is None:
+        retention_days = settings.expense_archive_retention_days
+    if batch_size is None:
+        batch_size = settings.expense_archive_batch_size
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        try:
+            moved = db.execute(_ARCHIVE_BATCH_SQL, {"cutoff": cutoff, "batch_size": batch_size}).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    return total
+
+
+def get_expense(db: Session, expense_id: uuid.UUID) -> Optional[Union[Expense, ExpenseArchive]]:
+    """
+    Fetch an expense by id from the hot table, falling back to the archive.
+    """
+    return db.get(Expense, expense_id) or db.get(ExpenseArchive, expense_id)
@@ -0,0 +1,26 @@
+"""
+bcrypt functions executed inside the password hashing worker processes
+
+Kept free of app imports so that spawning a worker only loads passlib.
+"""
+import os
+from functools import lru_cache
+from passlib.hash import bcrypt
+
+
+@lru_cache(maxsize=None)
+def _handler(rounds: int):
+    return bcrypt.using(rounds=rounds)
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return _handler(rounds).hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return bcrypt.verify(password, password_hash)
+
+
+def warm_up() -> int:
+    """No-op task used to start the worker processes ahead of the first login"""
+    return os.getpid()
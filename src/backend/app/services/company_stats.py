@@ -0,0 +1,83 @@
+"""
+Per-company active user counters
+
+Counts come from one grouped aggregate over `users` and are kept in a TTL cache
+that the user endpoints adjust in place after they commit, so company stats
+cost one query on a miss and none on a hit. Other worker processes converge
+within `company_stats_cache_ttl_seconds`.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from src.backend.app.models.user import User
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.utils.cache import TTLCache
+from src.backend.app.utils.app.database import AsyncDbSession
+
+ROLES = ("admin", "manager", "employee")
+
+_counters = TTLCache(
+    settings.company_stats_cache_max_entries, settings.company_stats_cache_ttl_seconds, name="company_user_counts"
+)
+_counters_lock = threading.Lock()
+
+
+def _load_user_counts(db: Session, company_id) -> Dict[str, int]:
+    rows = db.execute(
+        select(User.role, func.count())
+        .where(User.company_id == company_id, User.is_active == True)
+        .group_by(User.role)
+    ).all()
+    counts = dict.fromkeys(ROLES, 0)
+    counts.update({role: count for role, count in rows})
+    return counts
+
+
+def get_user_counts(db: Session, company_id) -> Dict[str, int]:
+    """Active users per role for a company"""
+    counts = _counters.get(str(company_id))
+    if counts is None:
+        counts = _load_user_counts(db, company_id)
+        _counters.set(str(company_id), counts)
+    with _counters_lock:
+        return dict(counts)
+
+
+async def get_user_counts_async(db: AsyncDbSession, company_id) -> Dict[str, int]:
+    """get_user_counts for get_async_db sessions (no DB round trip on a cache hit)"""
+    counts = _counters.get(str(company_id))
+    if counts is None:
+        counts = await db.run_sync(_load_user_counts, company_id)
+        _counters.set(str(company_id), counts)
+    with _counters_lock:
+        return dict(counts)
+
+
+def record_user_change(
+    company_id,
+    before: Optional[Tuple[str, bool]],
+    after: Optional[Tuple[str, bool]],
+) -> None:
+    """
+    Apply a committed change to the cached counters, if this company is cached.
+    `before`/`after` are (role, is_active) of the user; None for a new user.
+    """
+    counts = _counters.get(str(company_id))
+    if counts is None:
+        return
+    with _counters_lock:
+        if before is not None and before[1]:
+            counts[before[0]] = max(0, counts.get(before[0], 0) - 1)
+        if after is not None and after[1]:
+            counts[after[0]] = counts.get(after[0], 0) + 1
+
+
+def record_users_created(company_id, roles: Dict[str, int]) -> None:
+    """Apply a bulk insert of active users ({role: count}) to the cached counters"""
+    counts = _counters.get(str(company_id))
+    if counts is None:
+        return
+    with _counters_lock:
+        for role, created in roles.items():
+            counts[role] = counts.get(role, 0) + created
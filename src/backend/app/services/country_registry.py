@@ -0,0 +1,62 @@
+from types import MappingProxyType
+from typing import Dict, List, Optional
+import pycountry
+from src.backend.app.services.iso4217_data import COUNTRY_CURRENCIES, CURRENCY_MINOR_UNITS
+
+class CountryRegistry:
+    """
+    Offline country/currency lookup tables
+    Built once from pycountry and the bundled ISO 4217 mapping; every lookup
+    afterwards is a dict access with no network or pycountry search involved.
+    """
+
+    def __init__(self):
+        currency_names = {currency.alpha_3: currency.name for currency in pycountry.currencies}
+
+        country_names = {}
+        for country in pycountry.countries:
+            # Prefer "Bolivia" over "Bolivia, Plurinational State of"
+            country_names[country.alpha_2] = getattr(country, "common_name", None) or country.name
+
+        self._country_names = MappingProxyType(country_names)
+        self._country_currencies = MappingProxyType(
+            {code: currency for code, currency in COUNTRY_CURRENCIES.items() if code in country_names}
+        )
+        self._currency_names = MappingProxyType(currency_names)
+
+        # Pre-formatted, pre-sorted payload for GET /api/countries/countries
+        self._countries = tuple(sorted(
+            (
+                {
+                    "country_code": code,
+                    "country_name": country_names[code],
+                    "currency_code": currency,
+                    "currency_name": currency_names.get(currency, currency),
+                }
+                for code, currency in self._country_currencies.items()
+            ),
+            key=lambda x: x["country_name"],
+        ))
+
+    def is_country(self, country_code: str) -> bool:
+        return country_code in self._country_names
+
+    def country_name(self, country_code: str) -> Optional[str]:
+        return self._country_names.get(country_code)
+
+    def currency_for_country(self, country_code: str) -> Optional[str]:
+        return self._country_currencies.get(country_code)
+
+    def currency_name(self, currency_code: str) -> Optional[str]:
+        return self._currency_names.get(currency_code)
+
+    def minor_units(self, currency_code: str) -> int:
+        """Decimal places used by the currency (ISO 4217 exponent)"""
+        return CURRENCY_MINOR_UNITS.get(currency_code, 2)
+
+    def countries_with_currencies(self) -> List[Dict]:
+        """All countries that have a currency, sorted by name (entries are shared, do not mutate)"""
+        return list(self._countries)
+
+# Built once at import
+country_registry = CountryRegistry()
@@ -1,7 +1,12 @@
 import httpx
 import asyncio
-from typing import List, Dict, Optional
+import json
+import os
+import time
+from typing import Awaitable, Callable, List, Dict, Optional
 from src.backend.app.utils.app.config import settings
+from src.backend.app.services.country_registry import country_registry
+from src.backend.app.utils.app.utils.metrics import CACHE_REQUESTS, UPSTREAM_REQUEST_DURATION
 
 class CountryService:
     """Service for fetching country and currency data"""
@@ -9,80 +14,224 @@ class CountryService:
     COUNTRIES_API = "https://restcountries.com/v3.1/all?fields=name,currencies,cca2"
     EXCHANGE_API = "https://api.exchangerate-api.com/v4/latest"
     
+    def __init__(self):
+        # Formatted countries list, cached in process and persisted to a snapshot file
+        self._countries: Optional[List[Dict]] = None
+        self._countries_fetched_at: float = 0.0
+        self._countries_failed_at: float = 0.0
+        self._countries_refresh: Optional[asyncio.Task] = None
+        # Shared keep-alive client, opened/closed with the application lifespan
+        self._client: Optional[httpx.AsyncClient] = None
+        # Upstream fetches currently in flight, keyed by request
+        self._inflight: Dict[str, asyncio.Task] = {}
+    
+    async def startup(self) -> None:
+        """Open the shared HTTP client"""
+        self._get_client()
+    
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        # Opened lazily as well, for callers outside the app lifespan (scripts, benchmarks)
+        if self._client is None:
+            self._client = CountryService._build_client()
+        return self._client
+    
     @staticmethod
-    async def get_countries_with_currencies() -> List[Dict]:
+    def _build_client() -> httpx.AsyncClient:
+        http2 = settings.http_client_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive_connections,
+                keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(
+                settings.http_client_timeout_seconds,
+                connect=settings.http_client_connect_timeout_seconds,
+            ),
+        )
+    
+    async def _timed_get(self, upstream: str, url: str) -> httpx.Response:
+        """GET through the shared client, recording latency per upstream and outcome"""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._get_client().get(url)
+            outcome = str(response.status_code)
+            return response
+        finally:
+            UPSTREAM_REQUEST_DURATION.labels(upstream, outcome).observe(time.perf_counter() - start)
+    
+    async def get_countries_with_currencies(self) -> List[Dict]:
         """
-        Fetch all countries with their currencies from REST Countries API
+        Get all countries with their currencies
+        Served from the offline registry unless remote refresh is enabled. In that
+        case the REST Countries list is cached; once older than the TTL the stale
+        list is returned immediately while a background task refreshes it. Before
+        the first successful fetch (and no snapshot) the registry is returned.
         Returns: List of countries with currency information
         """
+        if not settings.countries_remote_refresh:
+            return country_registry.countries_with_currencies()
+        
+        if self._countries is None:
+            self._load_countries_snapshot()
+        
+        now = time.time()
+        if self._countries is None:
+            # Cold start without a snapshot: serve the offline registry until the
+            # first fetch lands, so an unreachable upstream never delays requests
+            CACHE_REQUESTS.labels("countries", "miss").inc()
+            if now - self._countries_failed_at > settings.countries_refresh_retry_seconds:
+                self._schedule_countries_refresh()
+            return country_registry.countries_with_currencies()
+        
+        if now - self._countries_fetched_at > settings.countries_cache_ttl_seconds:
+            CACHE_REQUESTS.labels("countries", "stale").inc()
+            if now - self._countries_failed_at > settings.countries_refresh_retry_seconds:
+                self._schedule_countries_refresh()
+        else:
+            CACHE_REQUESTS.labels("countries", "hit").inc()
+        return self._countries
+    
+    def _schedule_countries_refresh(self) -> asyncio.Task:
+        """Start a background refresh unless one is already in flight"""
+        if self._countries_refresh is None or self._countries_refresh.done():
+            self._countries_refresh = asyncio.create_task(self._refresh_countries())
+        return self._countries_refresh
+    
+    async def _refresh_countries(self) -> None:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(CountryService.COUNTRIES_API, timeout=10.0)
-                response.raise_for_status()
-                
-                countries_data = response.json()
-                formatted_countries = []
+            countries = await self._fetch_countries()
+        except Exception as e:
+            print(f"Error fetching countries: {e}")
+            self._countries_failed_at = time.time()
+            return
+        
+        self._countries = countries
+        self._countries_fetched_at = time.time()
+        self._save_countries_snapshot()
+    
+    async def _fetch_countries(self) -> List[Dict]:
+        """
+        Fetch all countries with their currencies from REST Countries API
+        Returns: List of countries sorted by name
+        """
+        response = await self._timed_get("countries", self.COUNTRIES_API)
+        response.raise_for_status()
+        
+        countries_data = response.json()
+        formatted_countries = []
+        
+        for country in countries_data:
+            try:
+                # Get country name
+                country_name = country.get("name", {}).get("common", "Unknown")
+                country_code = country.get("cca2", "")
                 
-                for country in countries_data:
-                    try:
-                        # Get country name
-                        country_name = country.get("name", {}).get("common", "Unknown")
-                        country_code = country.get("cca2", "")
-                        
-                        # Get primary currency
-                        currencies = country.get("currencies", {})
-                        primary_currency = None
-                        currency_name = None
-                        
-                        if currencies:
-                            # Get the first currency (most countries have one primary currency)
-                            currency_code = list(currencies.keys())[0]
-                            currency_info = currencies[currency_code]
-                            primary_currency = currency_code
-                            currency_name = currency_info.get("name", currency_code)
-                        
-                        if country_code and primary_currency:
-                            formatted_countries.append({
-                                "country_code": country_code,
-                                "country_name": country_name,
-                                "currency_code": primary_currency,
-                                "currency_name": currency_name
-                            })
-                    except (KeyError, IndexError):
-                        # Skip countries with missing data
-                        continue
+                # Get primary currency
+                currencies = country.get("currencies", {})
+                primary_currency = None
+                currency_name = None
                 
-                # Sort by country name
-                formatted_countries.sort(key=lambda x: x["country_name"])
-                return formatted_countries
+                if currencies:
+                    # Get the first currency (most countries have one primary currency)
+                    currency_code = list(currencies.keys())[0]
+                    currency_info = currencies[currency_code]
+                    primary_currency = currency_code
+                    currency_name = currency_info.get("name", currency_code)
                 
-        except httpx.RequestError as e:
-            print(f"Error fetching countries: {e}")
-            return CountryService._get_fallback_countries()
+                if country_code and primary_currency:
+                    formatted_countries.append({
+                        "country_code": country_code,
+                        "country_name": country_name,
+                        "currency_code": primary_currency,
+                        "currency_name": currency_name
+                    })
+            except (KeyError, IndexError):
+                # Skip countries with missing data
+                continue
+        
+        # Sort by country name
+        formatted_countries.sort(key=lambda x: x["country_name"])
+        return formatted_countries
+    
+    def _load_countries_snapshot(self) -> None:
+        """Seed the cache from the last persisted snapshot, if any"""
+        try:
+            with open(settings.countries_snapshot_path, "r", encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+            self._countries = snapshot["countries"]
+            self._countries_fetched_at = float(snapshot["fetched_at"])
+        except FileNotFoundError:
+            return
         except Exception as e:
-            print(f"Unexpected error: {e}")
-            return CountryService._get_fallback_countries()
+            print(f"Ignoring unreadable countries snapshot: {e}")
     
-    @staticmethod
-    async def get_exchange_rates(base_currency: str = "USD") -> Dict:
+    def _save_countries_snapshot(self) -> None:
+        """Persist the cache atomically so restarts and outages can serve it"""
+        path = settings.countries_snapshot_path
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"fetched_at": self._countries_fetched_at, "countries": self._countries}, fh)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving countries snapshot: {e}")
+    
+    async def get_exchange_rates(self, base_currency: str = "USD") -> Dict:
         """
         Fetch current exchange rates for a base currency
+        Concurrent calls for the same base share a single upstream request.
         Args:
             base_currency: The base currency code (e.g., 'USD', 'EUR')
-        Returns: Dictionary with exchange rates
+        Returns: Dictionary with exchange rates (shared between callers, do not mutate)
         """
+        base_currency = base_currency.upper()
+        return await self._single_flight(
+            f"exchange-rates:{base_currency}",
+            lambda: self._fetch_exchange_rates(base_currency),
+        )
+    
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable]):
+        """Run `fetch()` at most once at a time per key; concurrent callers await the same task"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            
+            def _forget(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            task.add_done_callback(_forget)
+        # Shielded so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_exchange_rates(self, base_currency: str) -> Dict:
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{CountryService.EXCHANGE_API}/{base_currency.upper()}"
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                
-                data = response.json()
-                return {
-                    "base": data.get("base"),
-                    "date": data.get("date"),
-                    "rates": data.get("rates", {})
-                }
+            url = f"{self.EXCHANGE_API}/{base_currency}"
+            response = await self._timed_get("exchange_rates", url)
+            response.raise_for_status()
+            
+            data = response.json()
+            return {
+                "base": data.get("base"),
+                "date": data.get("date"),
+                "rates": data.get("rates", {})
+            }
                 
         except httpx.RequestError as e:
             print(f"Error fetching exchange rates: {e}")
@@ -90,25 +239,6 @@ class CountryService:
         except Exception as e:
             print(f"Unexpected error: {e}")
             return {"base": base_currency, "rates": {}, "error": str(e)}
-    
-    @staticmethod
-    def _get_fallback_countries() -> List[Dict]:
-        """
-        Fallback list of major countries with currencies
-        Used when API is unavailable
-        """
-        return [
-            {"country_code": "US", "country_name": "United States", "currency_code": "USD", "currency_name": "US Dollar"},
-            {"country_code": "GB", "country_name": "United Kingdom", "currency_code": "GBP", "currency_name": "British Pound"},
-            {"country_code": "DE", "country_name": "Germany", "currency_code": "EUR", "currency_name": "Euro"},
-            {"country_code": "FR", "country_name": "France", "currency_code": "EUR", "currency_name": "Euro"},
-            {"country_code": "IN", "country_name": "India", "currency_code": "INR", "currency_name": "Indian Rupee"},
-            {"country_code": "JP", "country_name": "Japan", "currency_code": "JPY", "currency_name": "Japanese Yen"},
-            {"country_code": "CA", "country_name": "Canada", "currency_code": "CAD", "currency_name": "Canadian Dollar"},
-            {"country_code": "AU", "country_name": "Australia", "currency_code": "AUD", "currency_name": "Australian Dollar"},
-            {"country_code": "CN", "country_name": "China", "currency_code": "CNY", "currency_name": "Chinese Yuan"},
-            {"country_code": "BR", "country_name": "Brazil", "currency_code": "BRL", "currency_name": "Brazilian Real"},
-        ]
 
 # Singleton instance for caching
 country_service = CountryService()
\ No newline at end of file
@@ -0,0 +1,311 @@
+import asyncio
+import bisect
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.models.fx_rate import FxRate
+from src.backend.app.services.country_service import country_service
+from src.backend.app.services.country_registry import country_registry
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import SessionLocal
+from src.backend.app.utils.app.utils.cache import TTLCache
+
+
+class FxRateStore:
+    """
+    In-memory copy of the `fx_rates` table
+    Holds one snapshot per day against the pivot currency; any base/quote pair on
+    any date is derived by cross-rate math (quote_per_pivot / base_per_pivot)
+    using the latest snapshot on or before that date.
+    """
+
+    def __init__(self, pivot_currency: str):
+        self.pivot_currency = pivot_currency
+        self._dates: List[date] = []  # sorted
+        self._snapshots: Dict[date, Dict[str, float]] = {}
+        # Cross tables already derived, keyed by (snapshot date, base); bounded, as
+        # the dates and bases come from unauthenticated request parameters
+        self._cross = TTLCache(
+            settings.fx_cross_cache_max_entries, settings.fx_cross_cache_ttl_seconds, name="fx_cross"
+        )
+        # Dense (snapshot date x currency) view for convert_batch, rebuilt lazily
+        self._vectors: Optional[Tuple[np.ndarray, Dict[str, int], np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def is_empty(self) -> bool:
+        return not self._dates
+
+    def load(self, db: Session) -> int:
+        """
+        Replace the in-memory snapshots with everything stored for the pivot
+        Returns: Number of daily snapshots loaded
+        """
+        snapshots: Dict[date, Dict[str, float]] = {}
+        rows = db.execute(
+            select(FxRate.rate_date, FxRate.currency_code, FxRate.rate)
+            .where(FxRate.pivot_currency == self.pivot_currency)
+        )
+        for rate_date, currency_code, rate in rows:
+            snapshots.setdefault(rate_date, {})[currency_code] = float(rate)
+
+        with self._lock:
+            self._snapshots = snapshots
+            self._dates = sorted(snapshots)
+            self._cross.clear()
+            self._vectors = None
+        return len(snapshots)
+
+    def add_snapshot(self, rate_date: date, rates: Dict[str, float]) -> None:
+        rates = {**rates, self.pivot_currency: 1.0}
+        with self._lock:
+            if rate_date not in self._snapshots:
+                bisect.insort(self._dates, rate_date)
+            self._snapshots[rate_date] = rates
+            self._cross.clear()
+            self._vectors = None
+
+    def snapshot_date(self, on_date: Optional[date] = None) -> Optional[date]:
+        """Date of the latest snapshot on or before `on_date` (default: latest overall)"""
+        dates = self._dates
+        if not dates:
+            return None
+        if on_date is None:
+            return dates[-1]
+        index = bisect.bisect_right(dates, on_date)
+        return dates[index - 1] if index else None
+
+    def rates_for(self, base_currency: str, on_date: Optional[date] = None) -> Optional[Tuple[date, Dict[str, float]]]:
+        """
+        Get every rate quoted against `base_currency`
+        Returns: (snapshot date, {quote: rate}) or None if there is no data for the base
+        """
+        snapshot_date = self.snapshot_date(on_date)
+        if snapshot_date is None:
+            return None
+
+        key = (snapshot_date, base_currency)
+        cross = self._cross.get(key)
+        if cross is None:
+            pivot_rates = self._snapshots[snapshot_date]
+            base_rate = pivot_rates.get(base_currency)
+            if base_rate is None:
+                return None
+            cross = {quote: rate / base_rate for quote, rate in pivot_rates.items()}
+            self._cross.set(key, cross)
+        return snapshot_date, cross
+
+    def rate(self, base_currency: str, quote_currency: str, on_date: Optional[date] = None) -> Optional[float]:
+        result = self.rates_for(base_currency, on_date)
+        if result is None:
+            return None
+        return result[1].get(quote_currency)
+
+    def _vector_tables(self) -> Tuple[np.ndarray, Dict[str, int], np.ndarray]:
+        tables = self._vectors
+        if tables is None:
+            with self._lock:
+                currencies = sorted({code for rates in self._snapshots.values() for code in rates})
+                index = {code: column for column, code in enumerate(currencies)}
+                matrix = np.full((len(self._dates), len(currencies)), np.nan)
+                for row, snapshot_date in enumerate(self._dates):
+                    for code, rate in self._snapshots[snapshot_date].items():
+                        matrix[row, index[code]] = rate
+                tables = (np.array(self._dates, dtype="datetime64[D]"), index, matrix)
+                self._vectors = tables
+        return tables
+
+    def convert_batch(
+        self,
+        amounts: Sequence[float],
+        source_currencies: Sequence[str],
+        target_currency: str,
+        dates: Optional[Sequence[date]] = None,
+    ) -> np.ndarray:
+        """
+        Convert many amounts into `target_currency` at once
+        Each row uses the latest snapshot on or before its date (the latest snapshot
+        when `dates` is omitted); results are rounded half-up to the target
+        currency's minor units.
+        Raises: ValueError for mismatched lengths, unknown currencies or missing rates
+        """
+        snapshot_dates, index, matrix = self._vector_tables()
+        if not len(snapshot_dates):
+            raise ValueError("No exchange rates available")
+
+        amounts = np.asarray(amounts, dtype=np.float64)
+        sources = np.asarray(source_currencies)
+        if sources.shape != amounts.shape:
+            raise ValueError("amounts and source_currencies must have the same length")
+
+        target_column = index.get(target_currency)
+        if target_column is None:
+            raise ValueError(f"Unknown currency: {target_currency}")
+
+        # One dict lookup per distinct currency, then fan out with the inverse index
+        codes, inverse = np.unique(sources, return_inverse=True)
+        try:
+            columns = np.array([index[code] for code in codes.tolist()], dtype=np.intp)[inverse]
+        except KeyError as e:
+            raise ValueError(f"Unknown currency: {e.args[0]}")
+
+        if dates is None:
+            rows = np.full(amounts.shape, len(snapshot_dates) - 1, dtype=np.intp)
+        else:
+            dates = np.asarray(dates, dtype="datetime64[D]")
+            if dates.shape != amounts.shape:
+                raise ValueError("dates must have the same length as amounts")
+            rows = np.searchsorted(snapshot_dates, dates, side="right") - 1
+            if (rows < 0).any():
+                raise ValueError(f"No exchange rates on or before {dates[rows < 0].min()}")
+
+        rates = matrix[rows, target_column] / matrix[rows, columns]
+        missing = np.isnan(rates)
+        if missing.any():
+            first = int(np.argmax(missing))
+            raise ValueError(f"No {sources[first]} rate on {snapshot_dates[rows[first]]}")
+
+        return _round_half_up(amounts * rates, country_registry.minor_units(target_currency))
+
+
+def _round_half_up(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Round half away from zero to `decimals` places, like Decimal ROUND_HALF_UP"""
+    scale = 10.0 ** decimals
+    # Snap off binary representation noise first (2.675 * 100 == 267.49999999999997)
+    scaled = np.round(np.abs(values) * scale, 6)
+    return np.copysign(np.floor(scaled + 0.5), values) / scale
+
+
+class RemoteFxSource:
+    """Pivot rate table from the exchange rate API"""
+
+    async def fetch(self, pivot_currency: str) -> Tuple[date, Dict[str, float]]:
+        data = await country_service.get_exchange_rates(pivot_currency)
+        if "error" in data:
+            raise RuntimeError(data["error"])
+        rate_date = date.fromisoformat(data["date"]) if data.get("date") else date.today()
+        return rate_date, {code: float(rate) for code, rate in data["rates"].items()}
+
+
+class StubFxSource:
+    """Deterministic, offline rate table for tests and local development"""
+
+    # Units per USD
+    RATES = {
+        "USD": 1.0, "EUR": 0.92, "GBP": 0.79, "INR": 83.2, "JPY": 149.5, "CAD": 1.36,
+        "AUD": 1.52, "CNY": 7.24, "CHF": 0.88, "SGD": 1.34, "AED": 3.6725, "BRL": 4.97,
+        "MXN": 17.1, "KRW": 1330.0, "ZAR": 18.6, "SEK": 10.6, "NOK": 10.7, "KWD": 0.308,
+    }
+
+    async def fetch(self, pivot_currency: str) -> Tuple[date, Dict[str, float]]:
+        pivot_rate = self.RATES.get(pivot_currency)
+        if pivot_rate is None:
+            raise ValueError(
+                f"Stub FX source has no rate for pivot currency {pivot_currency} "
+                f"(available: {', '.join(sorted(self.RATES))})"
+            )
+        return date.today(), {code: rate / pivot_rate for code, rate in self.RATES.items()}
+
+
+class FxRateFetcher:
+    """Fetches the pivot rate table, persists it to `fx_rates` and updates the store"""
+
+    def __init__(self, store: FxRateStore, source):
+        self.store = store
+        self.source = source
+        self._refresh: Optional[asyncio.Task] = None
+        self._failed_at: float = 0.0
+        self._last_error: Optional[str] = None
+
+    async def refresh(self, retry_backoff: bool = False) -> date:
+        """
+        Fetch and store today's snapshot (concurrent callers share one fetch).
+        With `retry_backoff`, a fetch that failed less than `fx_refresh_retry_seconds`
+        ago is not retried: its error is raised at once.
+        """
+        if self._refresh is None or self._refresh.done():
+            if (
+                retry_backoff and self._last_error is not None
+                and time.time() - self._failed_at < settings.fx_refresh_retry_seconds
+            ):
+                raise RuntimeError(self._last_error)
+            self._refresh = asyncio.create_task(self._fetch_and_store())
+        return await asyncio.shield(self._refresh)
+
+    async def _fetch_and_store(self) -> date:
+        try:
+            rate_date, rates = await self.source.fetch(self.store.pivot_currency)
+        except Exception as e:
+            self._failed_at = time.time()
+            self._last_error = str(e) or type(e).__name__
+            raise
+        self._last_error = None
+        # Serve the new rates even if persisting them fails
+        self.store.add_snapshot(rate_date, rates)
+        await run_in_threadpool(self._save, rate_date, rates)
+        return rate_date
+
+    def _save(self, rate_date: date, rates: Dict[str, float]) -> None:
+        rows = [
+            {
+                "pivot_currency": self.store.pivot_currency,
+                "rate_date": rate_date,
+                "currency_code": code,
+                "rate": rate,
+                "fetched_at": datetime.utcnow(),
+            }
+            for code, rate in rates.items()
+            if len(code) == 3 and rate > 0
+        ]
+        stmt = insert(FxRate).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["pivot_currency", "rate_date", "currency_code"],
+            set_={"rate": stmt.excluded.rate, "fetched_at": stmt.excluded.fetched_at},
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def load(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.store.load(db)
+        finally:
+            db.close()
+
+
+async def run_fx_refresh() -> None:
+    """
+    Load stored snapshots, then keep today's snapshot fresh for the lifetime of
+    the process (every `fx_refresh_interval_seconds`).
+    """
+    try:
+        loaded = await run_in_threadpool(fx_rate_fetcher.load)
+        print(f"Loaded {loaded} FX rate snapshot(s)")
+    except Exception as e:
+        print(f"Error loading FX rates: {e}")
+
+    while True:
+        try:
+            await fx_rate_fetcher.refresh()
+        except Exception as e:
+            print(f"Error refreshing FX rates: {e}")
+        await asyncio.sleep(settings.fx_refresh_interval_seconds)
+
+
+fx_rate_store = FxRateStore(settings.fx_pivot_currency)
+fx_rate_fetcher = FxRateFetcher(
+    fx_rate_store,
+    StubFxSource() if settings.fx_source == "stub" else RemoteFxSource(),
+)
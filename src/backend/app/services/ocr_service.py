@@ -1,8 +1,9 @@
 from __future__ import annotations
-import io, re
+import io, re, time
 from dataclasses import dataclass
 from typing import Optional
 from PIL import Image
+from src.backend.app.utils.app.config import settings
 
 try:
     import pytesseract
@@ -19,7 +20,20 @@ class OcrParsed:
     merchant: Optional[str]
     lines: list[str]
 
+FAKE_RECEIPT_TEXT = """Cafe Coffee Day
+12 MG Road, Bengaluru
+Date: 2025-10-04
+Cappuccino        2 x 180.00
+Blueberry Muffin  1 x 140.00
+Total INR 500.00
+"""
+
 def _extract_text(image_bytes: bytes) -> str:
+    if settings.ocr_engine == "fake":
+        # Stands in for Tesseract's CPU time without needing it installed
+        if settings.ocr_fake_latency_ms > 0:
+            time.sleep(settings.ocr_fake_latency_ms / 1000)
+        return FAKE_RECEIPT_TEXT
     img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
     if _HAS_TESS:
         try:
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import date, datetime
+from typing import Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import SessionLocal
+
+
+def ensure_expense_partitions(db: Session, months_ahead: Optional[int] = None) -> int:
+    """
+    Create any missing monthly partitions of `expenses` from the current month
+    up to `months_ahead` months in the future.
+    Returns: Number of partitions created
+    """
+    if months_ahead is None:
+        months_ahead = settings.expense_partition_months_ahead
+    created = db.execute(
+        text("SELECT ensure_expense_partitions(:start, :ahead)"),
+        {"start": date.today().replace(day=1), "ahead": months_ahead},
+    ).scalar()
+    db.commit()
+    return created or 0
+
+
+def default_partition_rows(db: Session) -> Tuple[int, Optional[datetime], Optional[datetime]]:
+    """
+    Rows that fell into `expenses_default` because their month had no partition.
+    They are moved out when that month's partition is created (alembic 0008).
+    Returns: (count, oldest created_at, newest created_at)
+    """
+    count, oldest, newest = db.execute(
+        text("SELECT count(*), min(created_at), max(created_at) FROM expenses_default")
+    ).one()
+    return count, oldest, newest
+
+
+def _ensure_partitions_once() -> None:
+    db = SessionLocal()
+    try:
+        created = ensure_expense_partitions(db)
+        if created:
+            print(f"Created {created} expense partition(s)")
+        count, oldest, newest = default_partition_rows(db)
+        if count:
+            print(f"Warning: {count} expense row(s) in expenses_default ({oldest} to {newest}), "
+                  f"outside the monthly partitions")
+    except Exception as e:
+        db.rollback()
+        print(f"Error ensuring expense partitions: {e}")
+    finally:
+        db.close()
+
+
+async def run_partition_maintenance() -> None:
+    """
+    Keep future expense partitions in place for the lifetime of the process.
+    Runs once immediately and then every `expense_partition_check_interval_seconds`.
+    """
+    while True:
+        await run_in_threadpool(_ensure_partitions_once)
+        await asyncio.sleep(settings.expense_partition_check_interval_seconds)
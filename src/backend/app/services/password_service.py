@@ -0,0 +1,224 @@
+"""
+Password hashing on a dedicated, size-limited process pool
+
+bcrypt is deliberately slow, so running it inside FastAPI's threadpool lets a
+burst of logins occupy every worker thread. PasswordHasher sends hashing and
+verification to a ProcessPoolExecutor instead (several cores, no GIL), caps the
+number of outstanding jobs and fails fast with PasswordHasherBusy once the
+queue is full. `stats()` reports queue depth and latency.
+
+Request handlers use `hash_async` / `verify_async`, which await the worker
+without holding a threadpool thread; `hash` / `verify` block the calling
+thread and are meant for scripts. `hash_many` (bulk imports) counts against
+the same limit but only ever takes idle workers, so the queue stays free for
+interactive requests.
+
+bcrypt rounds come from `bcrypt_rounds`, or are calibrated at first use to stay
+under `bcrypt_target_ms`. Hashes made with other rounds are reported by
+`needs_rehash` so login can upgrade them transparently.
+"""
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.services import bcrypt_worker
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.utils.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503"""
+
+
+def calibrate_rounds(target_ms: float, probe_rounds: int = 8) -> int:
+    """Highest bcrypt cost whose hash time stays under target_ms on this machine"""
+    bcrypt_worker.hash_password("calibration", probe_rounds)  # warm up the backend
+    start = time.perf_counter()
+    bcrypt_worker.hash_password("calibration", probe_rounds)
+    probe_ms = (time.perf_counter() - start) * 1000
+    # Each extra round doubles the work
+    rounds = probe_rounds + math.floor(math.log2(target_ms / probe_ms))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, rounds: int, target_ms: int = 0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._configured_rounds = rounds
+        self._target_ms = target_ms
+        self._rounds: Optional[int] = None
+        self._context: Optional[CryptContext] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Signalled whenever a job finishes (hash_many waits on it for an idle worker)
+        self._finished = threading.Condition(self._lock)
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def rounds(self) -> int:
+        if self._rounds is None:
+            with self._lock:
+                if self._rounds is None:
+                    rounds = self._configured_rounds
+                    if self._target_ms > 0:
+                        rounds = calibrate_rounds(self._target_ms)
+                        print(f"bcrypt rounds calibrated to {rounds} for a {self._target_ms} ms target")
+                    self._context = CryptContext(
+                        schemes=["bcrypt"],
+                        bcrypt__default_rounds=rounds,
+                        bcrypt__min_rounds=rounds,
+                        bcrypt__max_rounds=rounds,
+                    )
+                    self._rounds = rounds
+        return self._rounds
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a process that already runs threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _admit(self) -> None:
+        """Count a new job, or raise PasswordHasherBusy when the queue is full"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED.inc()
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+    def _finish(self, operation: str, elapsed: float) -> None:
+        PASSWORD_HASH_DURATION.labels(operation).observe(elapsed)
+        with self._finished:
+            self._pending -= 1
+            self._completed += 1
+            self._busy_seconds += elapsed
+            self._finished.notify_all()
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            # Inline mode (scripts, single-process tools)
+            with PASSWORD_HASH_DURATION.labels(fn.__name__).time():
+                return fn(*args)
+
+        self._admit()
+        start = time.perf_counter()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._finish(fn.__name__, time.perf_counter() - start)
+
+    async def _run_async(self, fn, *args):
+        if self.workers <= 0:
+            return await run_in_threadpool(self._run, fn, *args)
+
+        self._admit()
+        start = time.perf_counter()
+        try:
+            # Awaited on the event loop: no threadpool thread is held while bcrypt runs
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._finish(fn.__name__, time.perf_counter() - start)
+
+    def hash(self, password: str) -> str:
+        return self._run(bcrypt_worker.hash_password, password, self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._run(bcrypt_worker.verify_password, password, password_hash)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(bcrypt_worker.hash_password, password, self.rounds)
+
+    async def verify_async(self, password: str, password_hash: str) -> bool:
+        return await self._run_async(bcrypt_worker.verify_password, password, password_hash)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch across the workers (bulk imports), blocking the calling thread
+        A job is only submitted while a worker is idle, so a large batch never
+        fills the queue that login and signup depend on.
+        """
+        rounds = self.rounds
+        if self.workers <= 0 or len(passwords) < 2:
+            return [bcrypt_worker.hash_password(password, rounds) for password in passwords]
+
+        executor = self._get_executor()
+        futures = []
+        for password in passwords:
+            with self._finished:
+                while self._pending >= self.workers:
+                    self._finished.wait()
+                self._pending += 1
+                self._peak_pending = max(self._peak_pending, self._pending)
+            start = time.perf_counter()
+            try:
+                future = executor.submit(bcrypt_worker.hash_password, password, rounds)
+            except Exception:
+                self._finish("hash_password", 0.0)
+                raise
+            future.add_done_callback(
+                lambda _, start=start: self._finish("hash_password", time.perf_counter() - start)
+            )
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if the hash was made with parameters other than the current ones"""
+        self.rounds  # builds the context
+        return self._context.needs_update(password_hash)
+
+    def startup(self) -> None:
+        """Resolve rounds and start the worker processes before traffic arrives"""
+        self.rounds
+        if self.workers > 0:
+            executor = self._get_executor()
+            for future in [executor.submit(bcrypt_worker.warm_up) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending, completed = self._pending, self._completed
+            return {
+                "workers": self.workers,
+                "rounds": self._rounds,
+                "in_progress": min(pending, self.workers),
+                "queued": max(0, pending - self.workers),
+                "max_queue": self.max_queue,
+                "peak_pending": self._peak_pending,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_latency_ms": round(self._busy_seconds / completed * 1000, 2) if completed else None,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    rounds=settings.bcrypt_rounds,
+    target_ms=settings.bcrypt_target_ms,
+)
@@ -0,0 +1,153 @@
+"""
+Token revocation
+
+Every refresh token has a `jti`. When a token is exchanged (rotation) or
+revoked (logout), its jti is inserted into `revoked_tokens`; the insert is
+`ON CONFLICT DO NOTHING`, so a jti that is already there means the token was
+used or revoked before and the request is refused. Access tokens presented at
+logout are recorded the same way under their SHA-256 digest and refused by
+get_current_user until they expire.
+
+A Bloom filter of all unexpired revoked jtis is kept in memory and rebuilt
+from the table every `refresh_token_filter_rebuild_seconds`. A token the filter
+has never seen is not looked up before its rotation insert; a filter hit
+is confirmed with a primary-key lookup, so a replayed or revoked token is
+refused without writing anything.
+"""
+import asyncio
+import hashlib
+import math
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.models.revoked_token import RevokedToken
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import AsyncDbSession, SessionLocal
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationStore:
+    def __init__(self, error_rate: float):
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        self.filter_hits = 0
+        self.filter_misses = 0
+
+    def _build(self, jtis: Iterable[str], count: int) -> BloomFilter:
+        # Leave room for the revocations made until the next rebuild
+        bloom = BloomFilter(max(count * 2, 10000), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        return bloom
+
+    def rebuild(self, db: Session) -> int:
+        """Reload the filter from the table (purging expired rows first)"""
+        now = datetime.utcnow()
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        db.commit()
+        jtis = db.execute(select(RevokedToken.jti)).scalars().all()
+        self.load(jtis)
+        return len(jtis)
+
+    def load(self, jtis: List[str]) -> None:
+        """Replace the filter with one holding exactly `jtis`"""
+        bloom = self._build(jtis, len(jtis))
+        with self._lock:
+            self._filter = bloom
+
+    def _remember(self, jti: str) -> None:
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False means definitely not revoked as of the last rebuild (or by this process)"""
+        with self._lock:
+            bloom = self._filter
+        if bloom is None:
+            return True  # not loaded yet: fall back to the database
+        if jti in bloom:
+            self.filter_hits += 1
+            return True
+        self.filter_misses += 1
+        return False
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        if not self.might_be_revoked(jti):
+            return False
+        return db.get(RevokedToken, jti) is not None
+
+    async def is_revoked_async(self, db: AsyncDbSession, jti: str) -> bool:
+        """is_revoked for get_async_db sessions (no DB round trip on a filter miss)"""
+        if not self.might_be_revoked(jti):
+            return False
+        return await db.get(RevokedToken, jti) is not None
+
+    def _insert(self, db: Session, jti: str, user_id, expires_at: datetime) -> bool:
+        inserted = db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+            .returning(RevokedToken.jti)
+        ).first()
+        self._remember(jti)
+        return inserted is not None
+
+    def consume(self, db: Session, jti: str, user_id, expires_at: datetime) -> bool:
+        """
+        Mark a refresh token as used (rotation) within the caller's transaction.
+        Returns: False if it was already used or revoked
+        """
+        if self.is_revoked(db, jti):
+            return False
+        return self._insert(db, jti, user_id, expires_at)
+
+    def revoke(self, db: Session, jti: str, user_id, expires_at: datetime) -> None:
+        self._insert(db, jti, user_id, expires_at)
+
+
+revocation_store = RevocationStore(settings.refresh_token_filter_error_rate)
+
+
+def _rebuild_once() -> None:
+    db = SessionLocal()
+    try:
+        revocation_store.rebuild(db)
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding refresh token revocation filter: {e}")
+    finally:
+        db.close()
+
+
+async def run_revocation_filter_refresh() -> None:
+    """Rebuild the revocation filter now and every `refresh_token_filter_rebuild_seconds`"""
+    while True:
+        await run_in_threadpool(_rebuild_once)
+        await asyncio.sleep(settings.refresh_token_filter_rebuild_seconds)
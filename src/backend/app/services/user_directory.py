@@ -0,0 +1,116 @@
+"""
+Paginated, searchable user directory
+
+Users are listed in (last_name, first_name, id) order with keyset pagination:
+the opaque cursor carries the last row's sort key, so every page is an index
+range scan regardless of how deep the client pages. Totals are the planner's
+row estimate for the filtered query instead of an exact COUNT(*), except when
+the whole result fits in the first page.
+
+Search modes (indexes in alembic 0005_users_directory_indexes):
+- prefix: name or email starts with the query (text_pattern_ops indexes)
+- fuzzy: pg_trgm word similarity on "first last email" (GIN trigram index)
+"""
+import base64
+import json
+import uuid
+from typing import List, Optional, Tuple
+from sqlalchemy import func, literal, literal_column, or_, select, tuple_
+from sqlalchemy.orm import Session
+from src.backend.app.models.user import User
+
+SEARCH_MODES = ("prefix", "fuzzy")
+
+# Must match the users_search_trgm_idx expression exactly
+SEARCH_DOCUMENT = func.lower(
+    User.first_name + literal_column("' '") + User.last_name + literal_column("' '") + User.email
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(user: User) -> str:
+    key = [user.last_name, user.first_name, str(user.id)]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_name, first_name, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        return last_name, first_name, uuid.UUID(user_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_clause(q: str, mode: str):
+    q = q.strip().lower()
+    if mode == "fuzzy":
+        # word_similarity(q, document) above pg_trgm.word_similarity_threshold
+        return literal(q).op("<%")(SEARCH_DOCUMENT)
+    pattern = _escape_like(q) + "%"
+    return or_(
+        func.lower(User.email).like(pattern, escape="\\"),
+        func.lower(User.first_name).like(pattern, escape="\\"),
+        func.lower(User.last_name).like(pattern, escape="\\"),
+    )
+
+
+def estimate_rows(db: Session, stmt) -> int:
+    """Planner row estimate for a SELECT, via EXPLAIN (no execution)"""
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def list_users(
+    db: Session,
+    company_id,
+    limit: int,
+    cursor: Optional[str] = None,
+    role: Optional[str] = None,
+    manager_id=None,
+    is_active: Optional[bool] = True,
+    q: Optional[str] = None,
+    search: str = "prefix",
+) -> Tuple[List[User], Optional[str], int, bool]:
+    """
+    One page of a company's users.
+    Returns: (users, next_cursor, total, total_is_estimate)
+    """
+    filters = [User.company_id == company_id]
+    if role is not None:
+        filters.append(User.role == role)
+    if manager_id is not None:
+        filters.append(User.manager_id == manager_id)
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    if q and q.strip():
+        filters.append(_search_clause(q, search))
+
+    page_stmt = select(User).where(*filters)
+    if cursor:
+        page_stmt = page_stmt.where(
+            tuple_(User.last_name, User.first_name, User.id) > tuple_(*decode_cursor(cursor))
+        )
+    page_stmt = page_stmt.order_by(User.last_name, User.first_name, User.id).limit(limit + 1)
+
+    users = list(db.execute(page_stmt).scalars())
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1])
+
+    if cursor is None and next_cursor is None:
+        # Everything fit in the first page: the exact total is free
+        return users, None, len(users), False
+    total = estimate_rows(db, select(User.id).where(*filters))
+    return users, next_cursor, max(total, len(users)), True
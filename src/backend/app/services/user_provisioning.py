@@ -0,0 +1,249 @@
+"""
+Bulk employee provisioning
+
+Validates a whole batch with a handful of set-based queries (existing emails,
+manager references) instead of per-row lookups, then hashes the passwords
+across the hashing pool and writes the users with multi-row INSERTs, chunk by
+chunk in a single transaction. Invalid rows are reported individually and
+skipped.
+
+Managers may be referenced by `manager_id` (existing user) or `manager_email`
+(existing user or a manager row of the same batch).
+"""
+import csv
+import io
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+from src.backend.app.models.user import User
+from src.backend.app.schemas.auth_schemas import CreateUserRequest
+from src.backend.app.services.password_service import password_hasher
+from src.backend.app.services.company_stats import record_users_created
+from src.backend.app.utils.app.config import settings
+
+BULK_COLUMNS = ("email", "password", "first_name", "last_name", "role", "manager_id", "manager_email")
+
+# Keeps IN (...) lists and INSERT statements at a reasonable size
+_LOOKUP_CHUNK = 1000
+
+# Passwords hashed between two progress events (a few seconds of bcrypt work)
+_HASH_BATCH = 50
+
+
+def parse_csv(content: bytes) -> List[Dict]:
+    """Rows of a CSV upload with a header line; blank cells become None"""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    return [
+        {key.strip(): (value.strip() or None) if value else None for key, value in row.items() if key}
+        for row in reader
+    ]
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def provision_users(db: Session, company_id, rows: List[Dict], chunk_size: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Create users for `company_id` from `rows` (dicts with BULK_COLUMNS keys).
+    Yields {"type": "progress", "hashed", "inserted", "total"} once validation is
+    done, then while passwords are hashed and after every inserted chunk, and
+    finally one {"type": "result", ...} (or {"type": "error", ...} if hashing or
+    the insert failed).
+    """
+    if chunk_size is None:
+        chunk_size = settings.user_bulk_chunk_size
+    errors: Dict[int, str] = {}
+    valid: Dict[int, CreateUserRequest] = {}
+    manager_emails: Dict[int, str] = {}
+
+    # 1) Row-level validation, reusing the single-user request rules
+    for index, row in enumerate(rows):
+        try:
+            valid[index] = CreateUserRequest(
+                email=row.get("email"),
+                password=row.get("password"),
+                first_name=row.get("first_name"),
+                last_name=row.get("last_name"),
+                role=row.get("role") or "employee",
+                manager_id=row.get("manager_id"),
+            )
+        except ValidationError as e:
+            errors[index] = _validation_message(e)
+            continue
+        if row.get("manager_email"):
+            manager_emails[index] = row["manager_email"].lower()
+        if valid[index].manager_id:
+            try:
+                uuid.UUID(valid[index].manager_id)
+            except ValueError:
+                errors[index] = "manager_id: not a valid id"
+                del valid[index]
+
+    # 2) Duplicates within the batch
+    first_row_for_email: Dict[str, int] = {}
+    for index, data in list(valid.items()):
+        email = data.email.lower()
+        if email in first_row_for_email:
+            errors[index] = f"email: duplicate of row {first_row_for_email[email] + 1}"
+            del valid[index]
+        else:
+            first_row_for_email[email] = index
+
+    # 3) Emails already registered (one query per chunk of addresses)
+    emails = list(first_row_for_email)
+    taken = set()
+    for chunk in _chunks(emails, _LOOKUP_CHUNK):
+        taken.update(db.execute(
+            select(func.lower(User.email)).where(func.lower(User.email).in_(chunk))
+        ).scalars())
+    for index, data in list(valid.items()):
+        if data.email.lower() in taken:
+            errors[index] = "email: user with this email already exists"
+            del valid[index]
+
+    # 4) Manager references: existing managers of this company in one pass...
+    ref_ids = {uuid.UUID(data.manager_id) for data in valid.values() if data.manager_id}
+    ref_emails = {manager_emails[index] for index in valid if index in manager_emails}
+    existing_managers_by_id, existing_managers_by_email = {}, {}
+    if ref_ids or ref_emails:
+        ref_ids_list, ref_emails_list = list(ref_ids), list(ref_emails)
+        for offset in range(0, max(len(ref_ids_list), len(ref_emails_list)), _LOOKUP_CHUNK):
+            ids_chunk = ref_ids_list[offset:offset + _LOOKUP_CHUNK]
+            emails_chunk = ref_emails_list[offset:offset + _LOOKUP_CHUNK]
+            managers = db.execute(
+                select(User.id, User.email).where(
+                    User.company_id == company_id,
+                    User.is_active == True,
+                    User.role.in_(("admin", "manager")),
+                    or_(User.id.in_(ids_chunk), func.lower(User.email).in_(emails_chunk)),
+                )
+            ).all()
+            for manager_id, email in managers:
+                existing_managers_by_id[manager_id] = manager_id
+                existing_managers_by_email[email.lower()] = manager_id
+
+    # ...and manager rows of this batch, which get their ids up front
+    new_ids = {index: uuid.uuid4() for index in valid}
+    batch_managers = {
+        data.email.lower(): index for index, data in valid.items() if data.role == "manager"
+    }
+    parent: Dict[int, Optional[int]] = {}  # row -> in-batch manager row
+    resolved_manager: Dict[int, Optional[uuid.UUID]] = {}
+    for index, data in list(valid.items()):
+        parent[index] = None
+        if data.manager_id:
+            manager_id = existing_managers_by_id.get(uuid.UUID(data.manager_id))
+            if manager_id is None:
+                errors[index] = "manager_id: invalid manager specified"
+                del valid[index]
+                continue
+            resolved_manager[index] = manager_id
+        elif index in manager_emails:
+            email = manager_emails[index]
+            if email in existing_managers_by_email:
+                resolved_manager[index] = existing_managers_by_email[email]
+            elif email in batch_managers and batch_managers[email] != index:
+                parent[index] = batch_managers[email]
+                resolved_manager[index] = new_ids[batch_managers[email]]
+            else:
+                errors[index] = "manager_email: invalid manager specified"
+                del valid[index]
+                continue
+        else:
+            resolved_manager[index] = None
+
+    # Insert managers before their reports; drop rows whose manager row failed
+    depth: Dict[int, int] = {}
+
+    def _depth(index: int, seen: frozenset) -> Optional[int]:
+        if index in depth:
+            return depth[index]
+        manager_row = parent.get(index)
+        if manager_row is None:
+            depth[index] = 0
+            return 0
+        if manager_row in seen:
+            return None  # cycle
+        if manager_row not in valid:
+            return None
+        manager_depth = _depth(manager_row, seen | {index})
+        if manager_depth is None:
+            return None
+        depth[index] = manager_depth + 1
+        return depth[index]
+
+    for index in list(valid):
+        if _depth(index, frozenset()) is None:
+            errors[index] = "manager_email: manager row is invalid or circular"
+    for index in [index for index in valid if index in errors]:
+        del valid[index]
+
+    # 5) Per chunk: hash the passwords across the pool, then one multi-row INSERT.
+    # Managers come before their reports; everything is one transaction.
+    order = sorted(valid, key=lambda index: (depth[index], index))
+    total = len(order)
+    now = datetime.utcnow()
+    values = []
+    inserted = 0
+    yield {"type": "progress", "hashed": 0, "inserted": 0, "total": total}
+    try:
+        for chunk in _chunks(order, chunk_size):
+            hashes = []
+            for batch in _chunks(chunk, _HASH_BATCH):
+                hashes.extend(password_hasher.hash_many(
+                    [User.prepare_password(valid[index].password) for index in batch]
+                ))
+                yield {"type": "progress", "hashed": len(values) + len(hashes), "inserted": inserted, "total": total}
+            chunk_values = [
+                {
+                    "id": new_ids[index],
+                    "email": valid[index].email,
+                    "password_hash": password_hash,
+                    "first_name": valid[index].first_name,
+                    "last_name": valid[index].last_name,
+                    "is_active": True,
+                    "role": valid[index].role,
+                    "company_id": company_id,
+                    "manager_id": resolved_manager[index],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index, password_hash in zip(chunk, hashes)
+            ]
+            db.execute(insert(User.__table__).values(chunk_values))
+            values.extend(chunk_values)
+            inserted += len(chunk_values)
+            yield {"type": "progress", "hashed": len(values), "inserted": inserted, "total": total}
+        db.commit()
+        created_roles: Dict[str, int] = {}
+        for value in values:
+            created_roles[value["role"]] = created_roles.get(value["role"], 0) + 1
+        record_users_created(company_id, created_roles)
+    except Exception as e:
+        db.rollback()
+        print(f"Error provisioning users: {e}")
+        yield {"type": "error", "detail": f"Provisioning failed, no users were created: {e}"}
+        return
+
+    yield {
+        "type": "result",
+        "total": len(rows),
+        "created": inserted,
+        "failed": len(errors),
+        "errors": [
+            {"row": index + 1, "email": rows[index].get("email"), "error": message}
+            for index, message in sorted(errors.items())
+        ],
+        "user_ids": [str(value["id"]) for value in values],
+    }
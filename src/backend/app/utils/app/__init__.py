@@ -1,10 +1,46 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.backend.app.api.routers.auth import router as auth_router
 from src.backend.app.api.routers.users import router as users_router
 from src.backend.app.api.routers.companies import router as companies_router
 from src.backend.app.api.routers.countries import router as countries_router
 from src.backend.app.api.routers.expenses import router as expenses_router
+from src.backend.app.api.routers.internal import router as internal_router
+from src.backend.app.services.partition_service import run_partition_maintenance
+from src.backend.app.services.country_service import country_service
+from src.backend.app.services.fx_service import run_fx_refresh
+from src.backend.app.services.token_revocation import run_revocation_filter_refresh
+from src.backend.app.utils.app.read_replicas import run_replica_lag_monitor
+from src.backend.app.services.password_service import password_hasher, PasswordHasherBusy
+from src.backend.app.utils.app.utils.query_stats import install_query_stats
+from src.backend.app.utils.app.utils.metrics import install_metrics, mark_process_dead, run_metrics_sampler
+from src.backend.app.api.routers.internal import require_internal_token
+from src.backend.app.utils.app.database import engine, pool_stats
+from sqlalchemy import text
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await country_service.startup()
+    await asyncio.to_thread(password_hasher.startup)
+    # Background maintenance tasks for the lifetime of the process
+    partition_task = asyncio.create_task(run_partition_maintenance())
+    fx_task = asyncio.create_task(run_fx_refresh())
+    revocation_task = asyncio.create_task(run_revocation_filter_refresh())
+    replica_lag_task = asyncio.create_task(run_replica_lag_monitor())
+    metrics_task = asyncio.create_task(run_metrics_sampler())
+    yield
+    metrics_task.cancel()
+    replica_lag_task.cancel()
+    revocation_task.cancel()
+    fx_task.cancel()
+    partition_task.cancel()
+    await country_service.shutdown()
+    password_hasher.shutdown()
+    mark_process_dead()
 
 
 def create_app():
@@ -13,7 +49,8 @@ def create_app():
         description="Authentication & User Management System",
         version="1.0.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        lifespan=lifespan
     )
     
     # Add CORS middleware
@@ -25,14 +62,27 @@ def create_app():
         allow_headers=["*"],
     )
     
+    # Query count / DB time per request (Server-Timing header, slow request log)
+    install_query_stats(app)
+    
+    # Request latency/status per route and GET /metrics (Prometheus)
+    install_metrics(app, dependencies=[require_internal_token])
+    
     # Include routers
     app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
     app.include_router(users_router, prefix="/api/users", tags=["User Management"])
     app.include_router(companies_router, prefix="/api/companies", tags=["Company"])
     app.include_router(countries_router, prefix="/api/countries", tags=["Countries & Currencies"])
     app.include_router(expenses_router, prefix="/api/expenses", tags=["Expenses / OCR"])
+    app.include_router(internal_router, prefix="/internal", tags=["Internal"])
 
-
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Too many concurrent password operations, retry shortly"},
+            headers={"Retry-After": "1"}
+        )
     
     @app.get("/")
     def root():
@@ -47,4 +97,25 @@ def create_app():
     def health_check():
         return {"status": "healthy"}
     
+    @app.get("/ready")
+    def readiness_check():
+        """Ready to take traffic: database reachable and connection pool not exhausted"""
+        pools = pool_stats()
+        checks = {}
+        if any(pool["saturated"] for pool in pools.values()):
+            # Don't queue behind the requests that are already waiting for a connection
+            checks["database"] = "skipped: connection pool exhausted"
+        else:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                checks["database"] = "ok"
+            except Exception as e:
+                checks["database"] = f"error: {e.__class__.__name__}"
+        ready = checks["database"] == "ok"
+        return JSONResponse(
+            status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "ready" if ready else "not ready", "checks": checks, "db_pool": pools}
+        )
+    
     return app
\ No newline at end of file
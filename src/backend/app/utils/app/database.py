@@ -1,9 +1,34 @@
+from typing import AsyncIterator, Optional, Union
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-engine = create_engine(settings.database_url)
+def _pool_options(pool_size: Optional[int] = None) -> dict:
+    return {
+        "pool_size": settings.db_pool_size if pool_size is None else pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+def _connect_args(async_driver: bool = False) -> dict:
+    if not settings.db_statement_timeout_ms:
+        return {}
+    if async_driver:
+        return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_connect_args(),
+    **_pool_options(settings.db_sync_pool_size_in_async_mode if settings.database_async_mode else None)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -14,4 +39,90 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async mode (database_async_mode): routers written against get_async_db use an
+# AsyncSession on asyncpg and never occupy a threadpool worker while waiting on
+# the database. In the default sync mode they get ThreadedSession instead, which
+# exposes the same awaitable API on top of the sync engine.
+def _to_async_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.database_async_mode:
+    async_engine = create_async_engine(
+        settings.async_database_url or _to_async_url(settings.database_url),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=_connect_args(async_driver=True),
+        **_pool_options()
+    )
+    # expire_on_commit=False: attribute access after commit must not trigger IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+class ThreadedSession:
+    """The awaitable subset of AsyncSession, backed by a sync Session run in the threadpool"""
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        """Run fn(sync_session, *args) (AsyncSession.run_sync equivalent)"""
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+AsyncDbSession = Union[AsyncSession, ThreadedSession]
+
+
+async def get_async_db() -> AsyncIterator[AsyncDbSession]:
+    """Dependency to get an awaitable database session (AsyncSession in async mode)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = ThreadedSession(SessionLocal(expire_on_commit=False))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def pool_stats() -> dict:
+    """Checkout statistics of every engine's connection pool"""
+    stats = {"sync": engine.pool.stats()}
+    if async_engine is not None:
+        stats["async"] = async_engine.pool.stats()
+    return stats
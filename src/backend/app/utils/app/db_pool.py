@@ -0,0 +1,74 @@
+"""
+Connection pools that record checkout statistics
+
+Engines are created with these pool classes so /internal/db-pool and /ready can
+report how long requests wait for a connection, how many are in use and how
+far into overflow the pool is, instead of only seeing "QueuePool limit"
+errors after the fact.
+"""
+import threading
+import time
+from typing import Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _CheckoutStatsMixin:
+    def _init_checkout_stats(self) -> None:
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self):
+        with self._stats_lock:
+            self.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.waiting -= 1
+                self.checkouts += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "waiting": self.waiting,
+                "checkouts": checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "avg_checkout_ms": round(self.total_wait_seconds / checkouts * 1000, 3) if checkouts else None,
+                "max_checkout_ms": round(self.max_wait_seconds * 1000, 3),
+                "saturated": self.saturated(),
+            }
+
+    def saturated(self) -> bool:
+        """Every connection, overflow included, is in use and callers are queueing"""
+        return self.checkedout() >= self.size() + max(self._max_overflow, 0) and self.waiting > 0
+
+
+class InstrumentedQueuePool(_CheckoutStatsMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_checkout_stats()
+
+
+class InstrumentedAsyncQueuePool(_CheckoutStatsMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_checkout_stats()
@@ -0,0 +1,226 @@
+"""
+Read-replica routing
+
+Read-only endpoints depend on `get_read_db` and mutating ones on `get_write_db`.
+Reads go to a replica (round robin) unless:
+
+- no replica is configured, or every replica lags the primary by more than
+  `replica_max_lag_seconds` (lag is sampled in the background every
+  `replica_lag_check_interval_seconds`; a replica is not used before its first
+  successful sample, nor while it is not streaming WAL from the primary), or
+- the client wrote recently (read-your-writes): after a commit through
+  get_write_db, the same client reads from the primary for
+  `read_your_writes_seconds`. The client is recognized by its bearer token (per
+  process) and by a short-lived cookie (across worker processes).
+"""
+import asyncio
+import hashlib
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.database import (
+    AsyncDbSession, AsyncSessionLocal, SessionLocal, ThreadedSession, _connect_args, _pool_options, get_async_db,
+    get_db
+)
+from src.backend.app.utils.app.db_pool import InstrumentedQueuePool
+from src.backend.app.utils.app.utils.cache import TTLCache
+
+STICKY_COOKIE = "db_primary_until"
+
+# NULL when the replica is not streaming: "everything received is replayed" then
+# says nothing about the primary. Without pg_read_all_stats the receiver's status
+# reads as NULL, and a running receiver process is taken as streaming.
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            connect_args=_connect_args(),
+            **_pool_options()
+        )
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.lag_seconds: Optional[float] = None  # None: unknown, unreachable or not streaming
+        self.streaming: Optional[bool] = None  # None: not sampled yet
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def check_lag(self) -> Optional[float]:
+        try:
+            with self.engine.connect() as connection:
+                lag = connection.execute(_REPLICA_LAG_SQL).scalar()
+        except Exception as e:
+            self.lag_seconds = None
+            print(f"Error checking replica lag ({self.name}): {e}")
+            return None
+        if lag is None:
+            if self.streaming is not False:
+                print(f"Replica {self.name} is not receiving WAL from the primary, skipping it")
+            self.streaming = False
+            self.lag_seconds = None
+        else:
+            self.streaming = True
+            self.lag_seconds = float(lag)
+        return self.lag_seconds
+
+    def healthy(self) -> bool:
+        return self.lag_seconds is not None and self.lag_seconds <= settings.replica_max_lag_seconds
+
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._sticky = TTLCache(100000, settings.read_your_writes_seconds)
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy()]
+        if not healthy:
+            return None
+        with self._lock:
+            return healthy[next(self._next) % len(healthy)]
+
+    def check_lag(self) -> None:
+        for replica in self.replicas:
+            replica.check_lag()
+
+    def mark_wrote(self, client_key: Optional[str]) -> None:
+        if client_key:
+            self._sticky.set(client_key, True)
+
+    def is_sticky(self, request: Request, client_key: Optional[str]) -> bool:
+        until = request.cookies.get(STICKY_COOKIE)
+        if until:
+            try:
+                if float(until) > time.time():
+                    return True
+            except ValueError:
+                pass
+        return bool(client_key) and self._sticky.get(client_key) is not None
+
+    def stats(self) -> Dict:
+        return {
+            "replicas": [
+                {
+                    "url": replica.name,
+                    "lag_seconds": replica.lag_seconds,
+                    "streaming": replica.streaming,
+                    "healthy": replica.healthy(),
+                }
+                for replica in self.replicas
+            ],
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+replica_router = ReplicaRouter(settings.database_replica_urls)
+
+
+def _client_key(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def _set_sticky_cookie(response: Response) -> None:
+    # Lets the other worker processes route this (browser) client to the primary too
+    if replica_router.replicas and settings.read_your_writes_seconds > 0:
+        window = settings.read_your_writes_seconds
+        response.set_cookie(STICKY_COOKIE, str(time.time() + window), max_age=int(window) + 1, httponly=True)
+
+
+def _track_writes(session: Session, request: Request, response: Response) -> None:
+    """Make the client sticky once `session` commits (not for requests that only read)"""
+    client_key = _client_key(request)
+
+    def after_commit(_):
+        replica_router.mark_wrote(client_key)
+        _set_sticky_cookie(response)
+
+    event.listen(session, "after_commit", after_commit)
+
+
+def _read_session(request: Request) -> Session:
+    replica = None
+    if not replica_router.is_sticky(request, _client_key(request)):
+        replica = replica_router.pick()
+    if replica is None:
+        replica_router.primary_reads += 1
+        return SessionLocal()
+    replica_router.replica_reads += 1
+    return replica.sessionmaker()
+
+
+def get_read_db(request: Request):
+    """Dependency for read-only endpoints: a replica session when one is usable"""
+    db = _read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db(request: Request, response: Response, db: Session = Depends(get_db)) -> Session:
+    """
+    Dependency for mutating endpoints: the primary session of get_db (shared with
+    get_current_user within a request); commits make the client sticky
+    """
+    _track_writes(db, request, response)
+    return db
+
+
+async def get_async_write_db(
+    request: Request, response: Response, db: AsyncDbSession = Depends(get_async_db)
+) -> AsyncDbSession:
+    """
+    get_write_db for routers on get_async_db (the session is shared with
+    get_current_user_async within a request)
+    """
+    _track_writes(db.sync_session, request, response)
+    return db
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db for routers on get_async_db (async mode reads from the primary)"""
+    if AsyncSessionLocal is not None:
+        async for db in get_async_db():
+            yield db
+        return
+    db = ThreadedSession(_read_session(request))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def run_replica_lag_monitor() -> None:
+    """Sample replica lag every `replica_lag_check_interval_seconds` (no-op without replicas)"""
+    if not replica_router.replicas:
+        return
+    while True:
+        await run_in_threadpool(replica_router.check_lag)
+        await asyncio.sleep(settings.replica_lag_check_interval_seconds)
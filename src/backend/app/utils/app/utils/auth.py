@@ -1,14 +1,28 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 from src.backend.app.utils.app.config import settings
-from src.backend.app.utils.app.database import get_db
+from src.backend.app.utils.app.database import AsyncDbSession, get_async_db, get_db
 from src.backend.app.models.user import User
+from src.backend.app.services.token_revocation import revocation_store
+from src.backend.app.utils.app.utils.user_cache import cache_user, get_cached_user
+from src.backend.app.utils.app.utils.cache import TTLCache
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Verified claims (sub, type, exp) keyed by token digest, so a bearer token is
+# signature-checked once per process rather than on every request. Entries never
+# outlive the token's exp and are dropped when the signing key changes.
+_token_cache = TTLCache(settings.token_cache_max_entries, settings.token_cache_ttl_seconds, name="token_claims")
+_token_cache_key: Optional[Tuple[str, str]] = None
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -26,36 +40,96 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti identifies the token in the revocation store (rotated on every use)
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _credentials_exception():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _decode_claims(token: str) -> Tuple[Optional[str], Optional[str], float]:
+    """Return (sub, type, exp) for a valid token, from the cache when possible"""
+    global _token_cache_key
+    signing_key = (settings.secret_key, settings.algorithm)
+    if signing_key != _token_cache_key:
+        # Secret rotated: claims verified with the old key are no longer trusted
+        _token_cache.clear()
+        _token_cache_key = signing_key
+
+    digest = _token_digest(token)
+    claims = _token_cache.get(digest)
+    if claims is not None:
+        if claims[2] > time.time():
+            return claims
+        _token_cache.pop(digest)
+
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        raise _credentials_exception()
+
+    claims = (payload.get("sub"), payload.get("type"), float(payload.get("exp", 0)))
+    _token_cache.set(digest, claims, ttl=claims[2] - time.time())
+    return claims
+
 def verify_token(token: str, token_type: str = "access"):
+    user_id, token_type_claim, _ = _decode_claims(token)
+    if user_id is None or token_type_claim != token_type:
+        raise _credentials_exception()
+    return user_id
+
+def decode_refresh_token(token: str) -> Tuple[str, str, datetime]:
+    """Return (sub, jti, expires_at) of a valid refresh token"""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id: str = payload.get("sub")
-        token_type_claim: str = payload.get("type")
-        
-        if user_id is None or token_type_claim != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user_id
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("type") != "refresh":
+        raise _credentials_exception()
+    # Tokens issued before jti was added are identified by their digest
+    jti = payload.get("jti") or _token_digest(token)
+    return payload["sub"], jti, datetime.utcfromtimestamp(payload["exp"])
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    user_id = verify_token(credentials.credentials)
-    user = db.query(User).filter(User.id == user_id).first()
+def revoke_token(token: str) -> None:
+    """Forget a token's verified claims in this process"""
+    _token_cache.pop(_token_digest(token))
+
+def revoke_access_token(db: Session, token: str) -> None:
+    """
+    Revoke an access token before it expires (logout), within the caller's transaction
+    Recorded by digest in the revocation store, which get_current_user checks in
+    every process, and dropped from this process's claims cache.
+    """
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return  # invalid or expired already
+    if payload.get("type") != "access" or payload.get("sub") is None:
+        return
+    revocation_store.revoke(
+        db, _token_digest(token), uuid.UUID(payload["sub"]), datetime.utcfromtimestamp(payload["exp"])
+    )
+    revoke_token(token)
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
+
+def token_cache_stats() -> Dict:
+    return {
+        "entries": len(_token_cache),
+        "hits": _token_cache.hits,
+        "misses": _token_cache.misses,
+    }
+
+def _active_user(user: Optional[User]) -> User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,18 +144,68 @@ def get_current_user(
         )
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
-    if not current_user.is_admin():
+def _require_admin(user: User) -> User:
+    if not user.is_admin():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Admin role required."
         )
-    return current_user
+    return user
 
-def get_current_manager_user(current_user: User = Depends(get_current_user)):
-    if not current_user.is_manager():
+def _require_manager(user: User) -> User:
+    if not user.is_manager():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Manager or admin role required."
         )
-    return current_user
\ No newline at end of file
+    return user
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    user_id = verify_token(credentials.credentials)
+    # Revoked at logout; the in-memory filter answers most tokens without a query
+    if revocation_store.is_revoked(db, _token_digest(credentials.credentials)):
+        raise _credentials_exception()
+    # Hot path: rebuilt from the short-TTL cache without touching the database
+    user = get_cached_user(db, user_id)
+    if user is None:
+        user = db.query(User).options(joinedload(User.company)).filter(User.id == user_id).first()
+        if user is not None:
+            cache_user(user)
+    return _active_user(user)
+
+def get_current_admin_user(current_user: User = Depends(get_current_user)):
+    return _require_admin(current_user)
+
+def get_current_manager_user(current_user: User = Depends(get_current_user)):
+    return _require_manager(current_user)
+
+# Routers on get_async_db authenticate through these: the user is loaded with the
+# request's awaitable session (shared with get_async_write_db), so in async mode
+# an authenticated request takes no threadpool thread, and on a cache hit (user
+# cache and revocation filter) no connection either.
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncDbSession = Depends(get_async_db)
+):
+    user_id = verify_token(credentials.credentials)
+    if await revocation_store.is_revoked_async(db, _token_digest(credentials.credentials)):
+        raise _credentials_exception()
+    # Attaching a cached snapshot does no IO, so it needs no await
+    user = get_cached_user(db.sync_session, user_id)
+    if user is None:
+        user = (await db.execute(
+            select(User).options(joinedload(User.company)).where(User.id == uuid.UUID(str(user_id)))
+        )).scalars().first()
+        if user is not None:
+            cache_user(user)
+    return _active_user(user)
+
+async def get_current_admin_user_async(current_user: User = Depends(get_current_user_async)):
+    return _require_admin(current_user)
+
+async def get_current_manager_user_async(current_user: User = Depends(get_current_user_async)):
+    return _require_manager(current_user)
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from src.backend.app.utils.app.utils.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL
+    A cache created with maxsize <= 0 or ttl <= 0 is disabled: it never stores anything.
+    Named caches count their hits and misses in the cache_requests metric.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = CACHE_REQUESTS.labels(name, "hit") if name else None
+        self._miss_counter = CACHE_REQUESTS.labels(name, "miss") if name else None
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._record_miss()
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._record_miss()
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            if self._hit_counter is not None:
+                self._hit_counter.inc()
+            return value
+
+    def _record_miss(self) -> None:
+        self.misses += 1
+        if self._miss_counter is not None:
+            self._miss_counter.inc()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value`; `ttl` may shorten (never extend) the cache-wide TTL for this entry"""
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
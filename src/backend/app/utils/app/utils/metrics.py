@@ -0,0 +1,168 @@
+"""
+Prometheus metrics
+
+Request latency and status per route, OCR duration and jobs in flight, bcrypt
+timing, outbound fetch latency and cache hit/miss counts are recorded where
+they happen. Connection pool, password hasher and replica gauges are sampled
+from their stats() every `metrics_sample_interval_seconds` and on each scrape.
+
+With several worker processes set `prometheus_multiproc_dir` (or
+PROMETHEUS_MULTIPROC_DIR) to an empty directory, wiped before every server
+start: each worker then writes its samples there and GET /metrics aggregates
+all of them, whichever worker answers the scrape. Gauges are summed over the
+live workers (replica lag: the maximum).
+"""
+import asyncio
+import os
+import time
+from fastapi import Depends, FastAPI, Request, Response
+from src.backend.app.utils.app.config import settings
+
+# Must be set before prometheus_client is imported: it picks its value storage at import
+if settings.prometheus_multiproc_dir:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.prometheus_multiproc_dir)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route"]
+)
+HTTP_REQUESTS = Counter(
+    "http_requests", "Requests by route template and status code", ["method", "route", "status"]
+)
+
+OCR_DURATION = Histogram(
+    "ocr_duration_seconds", "Receipt text extraction time",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+OCR_JOBS_IN_FLIGHT = Gauge(
+    "ocr_jobs_in_flight", "OCR jobs running or waiting for a threadpool thread", multiprocess_mode="livesum"
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify latency, queueing included", ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5, 10),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected", "Password operations refused because the hashing queue was full"
+)
+PASSWORD_HASH_IN_PROGRESS = Gauge(
+    "password_hash_in_progress", "Password operations running in worker processes", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued", "Password operations waiting for a worker process", multiprocess_mode="livesum"
+)
+
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds", "Outbound API call latency", ["upstream", "outcome"]
+)
+CACHE_REQUESTS = Counter("cache_requests", "Cache lookups by result", ["cache", "result"])
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Connections by state (checked_out, checked_in, overflow) and pool size",
+    ["pool", "state"], multiprocess_mode="livesum",
+)
+DB_POOL_WAITING = Gauge(
+    "db_pool_waiting", "Callers waiting for a connection", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Connection checkouts", ["pool"])
+DB_POOL_CHECKOUT_TIMEOUTS = Counter("db_pool_checkout_timeouts", "Checkouts that hit the pool timeout", ["pool"])
+DB_POOL_CHECKOUT_WAIT = Counter(
+    "db_pool_checkout_wait_seconds", "Total time spent waiting for connections", ["pool"]
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds", "Last sampled replica lag (-1: unreachable)", ["replica"], multiprocess_mode="max"
+)
+
+# Cumulative pool counters at the previous sample, to turn them into counter increments
+_pool_totals = {}
+
+
+def _sample_pool(name: str, pool) -> None:
+    stats = pool.stats()
+    for state in ("checked_out", "checked_in", "overflow", "size"):
+        DB_POOL_CONNECTIONS.labels(name, state).set(stats[state])
+    DB_POOL_WAITING.labels(name).set(stats["waiting"])
+
+    totals = (pool.checkouts, pool.checkout_timeouts, pool.total_wait_seconds)
+    previous = _pool_totals.get(name, (0, 0, 0.0))
+    _pool_totals[name] = totals
+    DB_POOL_CHECKOUTS.labels(name).inc(max(0, totals[0] - previous[0]))
+    DB_POOL_CHECKOUT_TIMEOUTS.labels(name).inc(max(0, totals[1] - previous[1]))
+    DB_POOL_CHECKOUT_WAIT.labels(name).inc(max(0.0, totals[2] - previous[2]))
+
+
+def sample_runtime_metrics() -> None:
+    """Copy this process's pool, hasher and replica stats into their gauges"""
+    # Imported here: those modules record metrics themselves and import this one
+    from src.backend.app.services.password_service import password_hasher
+    from src.backend.app.utils.app.database import async_engine, engine
+    from src.backend.app.utils.app.read_replicas import replica_router
+
+    _sample_pool("primary", engine.pool)
+    if async_engine is not None:
+        _sample_pool("primary_async", async_engine.pool)
+    for replica in replica_router.replicas:
+        name = f"{replica.engine.url.host}:{replica.engine.url.port or 5432}"
+        _sample_pool(f"replica:{name}", replica.engine.pool)
+        DB_REPLICA_LAG.labels(name).set(-1 if replica.lag_seconds is None else replica.lag_seconds)
+
+    hasher = password_hasher.stats()
+    PASSWORD_HASH_IN_PROGRESS.set(hasher["in_progress"])
+    PASSWORD_HASH_QUEUED.set(hasher["queued"])
+
+
+def render_metrics() -> bytes:
+    """All metrics in the Prometheus text format (every worker's, in multiprocess mode)"""
+    sample_runtime_metrics()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory (on shutdown)"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+async def run_metrics_sampler() -> None:
+    """Keep this worker's gauges current, also when another worker answers the scrape"""
+    if not settings.metrics_enabled:
+        return
+    while True:
+        try:
+            sample_runtime_metrics()
+        except Exception as e:
+            print(f"Error sampling metrics: {e}")
+        await asyncio.sleep(settings.metrics_sample_interval_seconds)
+
+
+def install_metrics(app: FastAPI, dependencies=()) -> None:
+    """Add the request metrics middleware and GET /metrics"""
+    if not settings.metrics_enabled:
+        return
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Route templates, not raw paths: ids in URLs would explode the label set
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(request.method, route_path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(request.method, route_path, str(status_code)).inc()
+
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(d) for d in dependencies])
+    def metrics():
+        return Response(content=render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,117 @@
+"""
+Per-request SQL statistics
+
+Engine-wide cursor events add every statement's duration to the QueryStats of
+the current request (a context variable set by the middleware, inherited by the
+threadpool workers that run sync endpoints and dependencies). The middleware
+reports them in a Server-Timing header and logs requests above the configured
+query-count or DB-time thresholds.
+
+For tests and scripts, `assert_max_queries` catches N+1 regressions:
+
+    with assert_max_queries(3):
+        client.get("/api/companies/stats", headers=auth_headers)
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.backend.app.utils.app.config import settings
+
+
+class QueryStats:
+    def __init__(self, capture_statements: bool = False):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Optional[List[str]] = [] if capture_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def server_timing(self) -> str:
+        return (
+            f'db;desc="{self.count} queries";dur={self.total_seconds * 1000:.1f}, '
+            f'db-slowest;dur={self.slowest_seconds * 1000:.1f}'
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Process-wide collectors for count_queries (tests: TestClient runs the app in another thread)
+_collectors: List[QueryStats] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in _collectors:
+        collector.record(statement, elapsed)
+
+
+@contextmanager
+def count_queries(capture_statements: bool = True) -> Iterator[QueryStats]:
+    """Collect statistics for every statement the process runs while the block is active"""
+    stats = QueryStats(capture_statements)
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than `limit` SQL statements"""
+    with count_queries(capture_statements=True) as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(stats.statements))
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}:\n{listing}")
+
+
+def install_query_stats(app: FastAPI) -> None:
+    """Add the per-request query statistics middleware"""
+    if not settings.query_stats_enabled:
+        return
+
+    @app.middleware("http")
+    async def query_stats_middleware(request: Request, call_next):
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+
+        if stats.count:
+            response.headers.append("Server-Timing", stats.server_timing())
+            total_ms = stats.total_seconds * 1000
+            if (
+                stats.count > settings.query_log_count_threshold
+                or total_ms > settings.query_log_time_ms_threshold
+            ):
+                slowest = " ".join((stats.slowest_statement or "").split())[:300]
+                print(
+                    f"Slow DB usage: {request.method} {request.url.path} ran {stats.count} queries "
+                    f"in {total_ms:.1f} ms (slowest {stats.slowest_seconds * 1000:.1f} ms: {slowest})"
+                )
+        return response
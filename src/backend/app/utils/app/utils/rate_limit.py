@@ -0,0 +1,146 @@
+"""
+Token-bucket rate limiting for the bcrypt-heavy auth endpoints
+
+Login and signup each cost a bcrypt hash, so bursts are refused with a 429
+before any database query or hashing happens. Buckets are kept per client IP
+and, for login, per account (email).
+
+Backends:
+- memory: per process; with N workers the effective limit is N times higher
+- sqlite: one file shared by all worker processes on the host (a local
+  stand-in for a shared store such as Redis)
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from fastapi import HTTPException, Request, status
+from src.backend.app.utils.app.config import settings
+
+
+def _refill(tokens: float, updated: float, now: float, rate_per_minute: float, burst: int) -> float:
+    return min(float(burst), tokens + (now - updated) * rate_per_minute / 60.0)
+
+
+def _take(tokens: float, rate_per_minute: float) -> Tuple[float, Optional[float]]:
+    """Consume one token; returns (tokens left, retry-after seconds or None)"""
+    if tokens >= 1.0:
+        return tokens - 1.0, None
+    return tokens, (1.0 - tokens) * 60.0 / rate_per_minute
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate_per_minute: float, burst: int) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(burst), now))
+            tokens, retry_after = _take(_refill(tokens, updated, now, rate_per_minute, burst), rate_per_minute)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                # Dropping the least recently hit bucket only ever resets it to full
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SqliteBucketStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, rate_per_minute: float, burst: int) -> Optional[float]:
+        now = time.time()  # wall clock: shared between processes
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (float(burst), now)
+            tokens, retry_after = _take(_refill(tokens, updated, now, rate_per_minute, burst), rate_per_minute)
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+
+def _build_store():
+    if settings.rate_limit_backend == "sqlite":
+        return SqliteBucketStore(settings.rate_limit_sqlite_path)
+    return MemoryBucketStore()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_store()
+    return _store
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_rate_limit(
+    request: Request,
+    scope: str,
+    per_ip: Tuple[float, int],
+    account: Optional[str] = None,
+    per_account: Optional[Tuple[float, int]] = None,
+) -> None:
+    """
+    Take one token from the caller's IP bucket (and account bucket) for `scope`.
+    Limits are (requests per minute, burst). Raises 429 with Retry-After.
+    """
+    if not settings.rate_limit_enabled:
+        return
+    store = _get_store()
+    try:
+        retry_after = store.hit(f"{scope}:ip:{client_ip(request)}", *per_ip)
+        if retry_after is None and account and per_account:
+            retry_after = store.hit(f"{scope}:account:{account.lower()}", *per_account)
+    except Exception as e:
+        # Fail open: a broken limiter backend must not lock everybody out
+        print(f"Error checking rate limit: {e}")
+        return
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
@@ -0,0 +1,60 @@
+"""
+Short-TTL cache of authenticated users and their companies
+
+get_current_user (or get_current_user_async) runs on every authenticated
+request. A cache hit rebuilds the User (with its Company already set) from a
+snapshot of column values and attaches it to the request's session without a
+SELECT, so the usual ORM workflow (modify + commit) keeps working. Entries are invalidated whenever a
+user is updated, deactivated or changes password; other worker processes see
+such changes once their entry expires (`user_cache_ttl_seconds`).
+"""
+from typing import Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from src.backend.app.models.user import User
+from src.backend.app.models.company import Company
+from src.backend.app.utils.app.config import settings
+from src.backend.app.utils.app.utils.cache import TTLCache
+
+_user_cache = TTLCache(settings.user_cache_max_entries, settings.user_cache_ttl_seconds, name="current_user")
+
+
+def _snapshot(obj) -> dict:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _attach(db: Session, cls, values: dict):
+    """Rebuild a persistent instance from a snapshot without querying"""
+    identity = inspect(cls).identity_key_from_primary_key([values["id"]])
+    existing = db.identity_map.get(identity)
+    if existing is not None:
+        return existing
+    obj = inspect(cls).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    db.add(obj)
+    return obj
+
+
+def cache_user(user: User) -> None:
+    """Snapshot a loaded user (and its company) into the cache"""
+    if not _user_cache.enabled:
+        return
+    _user_cache.set(str(user.id), (_snapshot(user), _snapshot(user.company)))
+
+
+def get_cached_user(db: Session, user_id: str) -> Optional[User]:
+    entry = _user_cache.get(str(user_id))
+    if entry is None:
+        return None
+    user_values, company_values = entry
+    company = _attach(db, Company, company_values)
+    user = _attach(db, User, user_values)
+    set_committed_value(user, "company", company)
+    return user
+
+
+def invalidate_user(user_id) -> None:
+    _user_cache.pop(str(user_id))
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backend.app.utils.app  # noqa: E402,F401  - loads the app package before its services
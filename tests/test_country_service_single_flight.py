@@ -0,0 +1,92 @@
+"""
+Concurrent exchange rate misses are coalesced into one upstream call
+
+CountryService is pointed at a local stub of the exchange rate API that counts
+requests per base and answers after a delay.
+"""
+import asyncio
+import json
+from collections import Counter
+from contextlib import asynccontextmanager
+
+from src.backend.app.services.country_service import CountryService
+
+CALLERS = 100
+DELAY = 0.2
+
+
+@asynccontextmanager
+async def stub_exchange_api(delay: float = DELAY):
+    """Yields (service, upstream calls per base) with the service bound to the stub"""
+    upstream_calls: Counter = Counter()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                base = request.split(b" ", 2)[1].rsplit(b"/", 1)[-1].decode()
+                upstream_calls[base] += 1
+                await asyncio.sleep(delay)
+                body = json.dumps({"base": base, "date": "2026-01-01", "rates": {base: 1.0}}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    service = CountryService()
+    service.EXCHANGE_API = f"http://127.0.0.1:{port}/v4/latest"
+    try:
+        async with server:
+            yield service, upstream_calls
+    finally:
+        await service.shutdown()
+
+
+def test_concurrent_misses_share_one_upstream_request_per_base():
+    async def scenario():
+        async with stub_exchange_api() as (service, upstream_calls):
+            results = await asyncio.gather(
+                *(service.get_exchange_rates("USD") for _ in range(CALLERS)),
+                *(service.get_exchange_rates("eur") for _ in range(CALLERS)),
+            )
+            return results, dict(upstream_calls)
+
+    results, upstream_calls = asyncio.run(scenario())
+    assert upstream_calls == {"USD": 1, "EUR": 1}
+    assert all("error" not in result for result in results)
+    assert {result["base"] for result in results} == {"USD", "EUR"}
+
+
+def test_miss_after_the_flight_landed_goes_upstream_again():
+    async def scenario():
+        async with stub_exchange_api(delay=0.01) as (service, upstream_calls):
+            await service.get_exchange_rates("USD")
+            await service.get_exchange_rates("USD")
+            return upstream_calls["USD"], service._inflight
+
+    calls, inflight = asyncio.run(scenario())
+    assert calls == 2
+    assert inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_fetch():
+    async def scenario():
+        async with stub_exchange_api() as (service, upstream_calls):
+            first = asyncio.create_task(service.get_exchange_rates("USD"))
+            second = asyncio.create_task(service.get_exchange_rates("USD"))
+            await asyncio.sleep(DELAY / 4)
+            first.cancel()
+            result = await second
+            return first.cancelled(), result, upstream_calls["USD"]
+
+    cancelled, result, calls = asyncio.run(scenario())
+    assert cancelled
+    assert result["rates"] == {"USD": 1.0}
+    assert calls == 1